@@ -2,6 +2,9 @@
 
 import streamlit as st
 import matplotlib.pyplot as plt
+import numpy as np
+
+from valuation import discount_factors
 
 # Title
 st.title("Forestry Carbon Project Revenue & NPV Model Demo")
@@ -19,18 +22,12 @@ project_years = st.slider('Project Duration (Years)', min_value=1, max_value=50,
 discount_rate = st.slider('Discount Rate (%)', min_value=0.0, max_value=20.0, value=5.0)
 
 # --- Model Calculations ---
-cash_flows = []
-undiscounted_flows = []
-years = list(range(1, project_years + 1))
-
-for year in years:
-    annual_revenue = carbon_price * annual_sequestration
-    discounted_revenue = annual_revenue / ((1 + discount_rate / 100) ** year)
-    cash_flows.append(discounted_revenue)
-    undiscounted_flows.append(annual_revenue)
-
-total_revenue = sum(undiscounted_flows)
-npv = sum(cash_flows)
+years = np.arange(1, project_years + 1)
+annual_revenue = carbon_price * annual_sequestration
+cash_flows = annual_revenue * discount_factors(discount_rate / 100, project_years)
+
+total_revenue = annual_revenue * project_years
+npv = cash_flows.sum()
 
 # --- Output Summary ---
 st.subheader("Results")
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+from nzu_data import load_nzu_indices
+from project_ids import parse_project_id
+from project_store import LOOKUP_COLUMNS, MAX_IDS_PER_REQUEST, cache_fetched, cached_project, cached_projects
+
+
+# Most same-day projects the Project Lookup page lists next to a project
+MAX_RELATED_PROJECTS = 50
+
+
+class AsyncRunner:
+    """Event loop on a daemon thread, so synchronous Streamlit code can await async clients.
+
+    Async clients hold connections bound to the loop that created them, so
+    they must be created and used through the same runner.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the runner's loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+
+async def fetch_project_async(client, project_id, columns=LOOKUP_COLUMNS, cache=None):
+    """Async counterpart of `project_store.fetch_project`"""
+    hit, row = cached_project(cache, project_id, columns)
+    if hit:
+        return row
+
+    response = await client.table("projects").select(",".join(columns)) \
+        .eq("project_id", project_id).execute()
+    row = response.data[0] if response.data else None
+
+    if cache is not None:
+        cache.set(project_id, row)
+    return row
+
+
+async def fetch_projects_async(client, project_ids, columns=LOOKUP_COLUMNS, cache=None):
+    """Async counterpart of `project_store.fetch_projects`, sending all batches concurrently"""
+    if "project_id" not in columns:
+        columns = ("project_id",) + tuple(columns)
+
+    rows, to_fetch = cached_projects(cache, project_ids, columns)
+    batches = [to_fetch[start:start + MAX_IDS_PER_REQUEST]
+               for start in range(0, len(to_fetch), MAX_IDS_PER_REQUEST)]
+    responses = await asyncio.gather(*(
+        client.table("projects").select(",".join(columns)).in_("project_id", batch).execute()
+        for batch in batches
+    ))
+    for batch, response in zip(batches, responses):
+        fetched = {row["project_id"]: row for row in response.data or []}
+        rows.update(fetched)
+        cache_fetched(cache, batch, fetched)
+    return rows
+
+
+async def fetch_same_day_projects_async(client, project_id, columns=LOOKUP_COLUMNS,
+                                        limit=MAX_RELATED_PROJECTS):
+    """Other projects whose ID shares this one's `YYMMDD` prefix, oldest submission first.
+
+    The prefix comes from the ID itself, so this needs no prior lookup of
+    the project row. IDs not in `YYMMDD-reqN` form have no related projects.
+    """
+    parsed = parse_project_id(project_id)
+    if parsed is None:
+        return []
+    response = await client.table("projects").select(",".join(columns)) \
+        .like("project_id", f"{parsed[0]}-req*").neq("project_id", project_id) \
+        .order("project_submission_date").order("project_id").limit(limit).execute()
+    return response.data or []
+
+
+async def load_lookup_data(client, project_id, cache=None):
+    """Fetch everything the Project Lookup page shows in one concurrent wait.
+
+    The project row and the other projects submitted the same day are two
+    database requests sent together, overlapped with reading the NZU price
+    history from disk on a worker thread. Returns
+    `(project_row, same_day_rows, price_history)`.
+    """
+    return await asyncio.gather(
+        fetch_project_async(client, project_id, cache=cache),
+        fetch_same_day_projects_async(client, project_id),
+        asyncio.to_thread(load_nzu_indices),
+    )
@@ -0,0 +1,55 @@
+import os
+
+import httpx
+import streamlit as st
+from dotenv import load_dotenv
+from supabase import AsyncClientOptions, ClientOptions, acreate_client, create_client
+
+from async_store import AsyncRunner
+from project_store import TTLCache
+from write_behind import WriteBehindQueue
+
+
+# Keep-alive connection pool shared by every session in the process
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(30.0)
+
+
+@st.cache_resource(show_spinner=False)
+def get_supabase():
+    """Process-wide Supabase client, created once and reused across reruns and sessions"""
+    load_dotenv()
+    http_client = httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    options = ClientOptions(httpx_client=http_client)
+    return create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"), options=options)
+
+
+@st.cache_resource(show_spinner=False)
+def get_async_runner():
+    """Process-wide event loop thread that owns the async Supabase client"""
+    return AsyncRunner()
+
+
+@st.cache_resource(show_spinner=False)
+def get_async_supabase():
+    """Process-wide async Supabase client; await it only via `get_async_runner()`"""
+    load_dotenv()
+
+    async def create():
+        http_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        options = AsyncClientOptions(httpx_client=http_client)
+        return await acreate_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"), options=options)
+
+    return get_async_runner().run(create())
+
+
+@st.cache_resource(show_spinner=False)
+def get_project_cache():
+    """Process-wide read-through cache for Project Lookup rows"""
+    return TTLCache()
+
+
+@st.cache_resource(show_spinner=False)
+def get_write_queue():
+    """Process-wide write-behind queue for project saves"""
+    return WriteBehindQueue(get_supabase(), cache=get_project_cache())
@@ -0,0 +1,61 @@
+import argparse
+import csv
+
+from project_store import DEFAULT_PAGE_SIZE, KEYSET_COLUMNS, LOOKUP_COLUMNS, iter_project_pages
+
+
+def export_csv(pages, path, columns):
+    """Write pages of rows to CSV as they arrive; returns the row count"""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for rows in pages:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def export_parquet(pages, path, columns):
+    """Write each page as a Parquet row group as it arrives; returns the row count"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet export needs pyarrow: pip install pyarrow")
+
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in pages:
+            table = pa.Table.from_pylist(
+                [{c: None if row.get(c) is None else str(row[c]) for c in columns} for row in rows],
+                schema=schema)
+            writer.write_table(table)
+            count += len(rows)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream the projects table to CSV or Parquet")
+    parser.add_argument("output", help="Output file path")
+    parser.add_argument("--format", choices=["csv", "parquet"],
+                        help="Output format (default: from the file extension)")
+    parser.add_argument("--columns", default=",".join(LOOKUP_COLUMNS),
+                        help="Comma-separated columns to export")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help="Rows fetched per request")
+    args = parser.parse_args(argv)
+
+    from db import get_supabase
+
+    fmt = args.format or ("parquet" if args.output.endswith(".parquet") else "csv")
+    columns = list(dict.fromkeys(list(KEYSET_COLUMNS) + args.columns.split(",")))
+    pages = iter_project_pages(get_supabase(), columns, args.page_size)
+
+    count = (export_parquet if fmt == "parquet" else export_csv)(pages, args.output, columns)
+    print(f"Exported {count} projects to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
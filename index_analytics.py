@@ -0,0 +1,166 @@
+import numpy as np
+
+from monte_carlo import OBSERVATIONS_PER_YEAR
+from nzu_data import NZU_INDEX_CSV, load_nzu_columns
+from price_series import PriceSeries, window_array
+
+
+# Derived column holding the daily ECMI minus ECQI difference
+SPREAD_COLUMN = "ECMI-ECQI spread"
+
+
+def _rolling_max(x, window):
+    """Trailing rolling maximum in O(n) via block prefix and suffix maxima, ignoring NaN"""
+    n = len(x)
+    blocks = -(-n // window)
+    padded = np.concatenate([x, np.full(blocks * window - n, np.nan)]).reshape(blocks, window)
+    prefix = np.fmax.accumulate(padded, axis=1).ravel()
+    suffix = np.fmax.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    out = np.full(n, np.nan)
+    end = np.arange(window - 1, n)
+    out[window - 1:] = np.fmax(suffix[end - window + 1], prefix[end])
+    return out
+
+
+class IndexAnalytics:
+    """Rolling statistics over the NZU index columns, computed from shared prefix sums.
+
+    Each column is a `PriceSeries`, whose prefix sums of prices and log
+    returns are built once on first use; every rolling mean or volatility
+    is then a difference of two prefix entries, so any number of windows
+    costs O(n) each without another pass over the data. Statistics for
+    several windows come back as one `(len(windows), n)` array; passing a
+    single window returns its row as a view. Non-positive prices are
+    masked, which for `Daily VWAP` means the days without trades; ECMI and
+    ECQI are quoted every day.
+
+    Besides the index columns, `SPREAD_COLUMN` holds ECMI minus ECQI and
+    supports the level statistics (mean, standard deviation, EWMA).
+    """
+
+    def __init__(self, columns):
+        self.dates = columns["Date"]
+        self.series = {name: PriceSeries(self.dates, values)
+                       for name, values in columns.items() if name != "Date"}
+        self._price_columns = frozenset(self.series)
+        if "ECMI" in self.series and "ECQI" in self.series:
+            ecmi, ecqi = self.series["ECMI"], self.series["ECQI"]
+            self.series[SPREAD_COLUMN] = PriceSeries(
+                self.dates, np.asarray(ecmi.values) - ecqi.values, ecmi.valid & ecqi.valid)
+
+    @classmethod
+    def from_index(cls, path=NZU_INDEX_CSV):
+        """Engine over the cached columns of the NZU index file"""
+        return cls(load_nzu_columns(path))
+
+    def __len__(self):
+        return len(self.dates)
+
+    def _series(self, column, prices_only=False):
+        if column not in self.series:
+            raise KeyError(f"Unknown index column: {column}")
+        if prices_only and column not in self._price_columns:
+            raise ValueError(f"{column} is not a price column")
+        return self.series[column]
+
+    def rolling_mean(self, column, windows):
+        """Trailing mean over the traded days of each window"""
+        return self._series(column).rolling_mean(windows)
+
+    def rolling_std(self, column, windows, ddof=1):
+        """Trailing standard deviation of the level over the traded days of each window"""
+        return self._series(column).rolling_std(windows, ddof)
+
+    def realized_volatility(self, column, windows, annualize=True):
+        """Trailing standard deviation of daily log returns, annualised by default.
+
+        Only returns between two consecutive traded days count.
+        """
+        out = self._series(column, prices_only=True).rolling_volatility(windows)
+        return out * np.sqrt(OBSERVATIONS_PER_YEAR) if annualize else out
+
+    def ewma(self, column, spans):
+        """Exponentially weighted mean with `alpha = 2 / (span + 1)` for each span.
+
+        Updated on traded days only and carried over no-trade days; NaN
+        before the first trade. All spans advance together in one pass.
+        """
+        spans, single = window_array(spans)
+        series = self._series(column)
+        valid = series.valid
+        traded = np.asarray(series.values, dtype=float)[valid]
+        alpha = 2.0 / (spans[:, 0] + 1.0)
+
+        smoothed = np.empty((len(alpha), len(traded)))
+        if len(traded):
+            current = np.full(len(alpha), traded[0])
+            for i, price in enumerate(traded):
+                current += alpha * (price - current)
+                smoothed[:, i] = current
+
+        last = np.cumsum(valid) - 1
+        out = smoothed[:, np.maximum(last, 0)] if len(traded) else np.empty((len(alpha), len(self)))
+        out[:, last < 0] = np.nan
+        return out[0] if single else out
+
+    def drawdown(self, column, windows=None):
+        """Fractional decline from the running peak price (0 at a peak, negative below it).
+
+        With `windows=None` the peak is the all-time high to date; otherwise
+        it is the highest price within each trailing window, computed in
+        O(n) per window. No-trade days carry the last traded price.
+        """
+        prices = self._series(column, prices_only=True).forward_filled()
+        if windows is None:
+            return prices / np.fmax.accumulate(prices) - 1
+        windows, single = window_array(windows)
+        out = np.stack([prices / _rolling_max(prices, window) - 1 for window in windows[:, 0]])
+        return out[0] if single else out
+
+    def spread(self, windows=None):
+        """ECMI minus ECQI, or its trailing mean over each of `windows`"""
+        if windows is None:
+            return self._series(SPREAD_COLUMN).values
+        return self.rolling_mean(SPREAD_COLUMN, windows)
+
+
+def benchmark_rolling(windows=range(5, 245, 5), column="ECMI", path=NZU_INDEX_CSV):
+    """Time every rolling statistic over many windows against per-window pandas rolling"""
+    import time
+
+    import pandas as pd
+
+    windows = list(windows)
+    start = time.perf_counter()
+    engine = IndexAnalytics.from_index(path)
+    engine.rolling_mean(column, windows)
+    engine.rolling_std(column, windows)
+    engine.realized_volatility(column, windows)
+    engine.ewma(column, windows)
+    engine.drawdown(column, windows)
+    engine.spread(windows)
+    engine_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prices = pd.Series(load_nzu_columns(path)[column])
+    returns = np.log(prices).diff()
+    for window in windows:
+        prices.rolling(window).mean()
+        prices.rolling(window).std()
+        returns.rolling(window).std()
+        prices.ewm(span=window, adjust=False).mean()
+        prices / prices.rolling(window).max() - 1
+    pandas_time = time.perf_counter() - start
+    return {"windows": len(windows), "rows": len(engine),
+            "engine_seconds": engine_time, "pandas_seconds": pandas_time}
+
+
+if __name__ == "__main__":
+    engine = IndexAnalytics.from_index()
+    print(f"{len(engine)} days of NZU index data")
+    for column in ("ECMI", "ECQI", "Daily VWAP"):
+        print(f"{column}: 30d mean {engine.rolling_mean(column, 30)[-1]:.2f}, "
+              f"30d volatility {engine.realized_volatility(column, 30)[-1]:.1%}, "
+              f"drawdown {engine.drawdown(column)[-1]:.1%}")
+    print(f"{SPREAD_COLUMN}: {engine.spread()[-1]:.2f} (30d mean {engine.spread(30)[-1]:.2f})")
+    print(benchmark_rolling())
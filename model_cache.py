@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from index_analytics import IndexAnalytics
+from sensitivity import SensitivityGrid, heatmap_figure, tornado_figure
+from valuation import carbon_revenue_model
+
+
+# Bounded LRU sizes for the process-wide caches shared by every session
+MAX_CACHED_PROJECTIONS = 512
+# Each SensitivityGrid holds ~36 MB, so keep only the current and previous discount rate
+MAX_CACHED_GRIDS = 2
+
+# Seconds before the index analytics engine is rebuilt, so daily drops show up
+INDEX_ANALYTICS_TTL = 3600
+
+
+@st.cache_data(max_entries=MAX_CACHED_PROJECTIONS)
+def revenue_projection(area_hectares, carbon_price_per_ton, sequestration_rate, project_years):
+    """Annual and cumulative revenue table for the Financial Modeling charts"""
+    revenues = carbon_revenue_model(area_hectares, carbon_price_per_ton,
+                                    sequestration_rate, project_years)
+    return pd.DataFrame({
+        "Year": range(1, project_years + 1),
+        "Annual Revenue ($)": revenues,
+        "Cumulative Revenue ($)": np.cumsum(revenues)
+    })
+
+
+@st.cache_data(max_entries=MAX_CACHED_PROJECTIONS)
+def revenue_figures(area_hectares, carbon_price_per_ton, sequestration_rate, project_years):
+    """Cumulative and annual revenue figures, built once per parameter combination"""
+    df = revenue_projection(area_hectares, carbon_price_per_ton, sequestration_rate, project_years)
+    fig1 = px.line(df, x="Year", y="Cumulative Revenue ($)", title="Cumulative Revenue Over Time")
+    fig2 = px.bar(df, x="Year", y="Annual Revenue ($)", title="Annual Revenue Projection")
+    return fig1, fig2
+
+
+@st.cache_resource(max_entries=MAX_CACHED_GRIDS)
+def sensitivity_grid(discount_rate):
+    """Sensitivity grid for a discount rate, shared read-only across sessions"""
+    return SensitivityGrid(discount_rate)
+
+
+@st.cache_data(max_entries=MAX_CACHED_PROJECTIONS)
+def sensitivity_figures(discount_rate, x_param, y_param, area_hectares, carbon_price_per_ton,
+                        sequestration_rate, project_years):
+    """Heatmap and tornado figures for one view of the sensitivity grid"""
+    grid = sensitivity_grid(discount_rate)
+    point = {
+        "area_hectares": area_hectares,
+        "carbon_price_per_ton": carbon_price_per_ton,
+        "sequestration_rate": sequestration_rate,
+        "project_years": project_years,
+    }
+    return (heatmap_figure(grid, x_param, y_param, **point),
+            tornado_figure(grid.tornado(**point)))
+
+
+@st.cache_resource(ttl=INDEX_ANALYTICS_TTL)
+def index_analytics():
+    """Rolling analytics over the NZU index, shared read-only across sessions"""
+    return IndexAnalytics.from_index()
@@ -0,0 +1,284 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from nzu_data import NZU_INDEX_CSV, load_price_series
+from valuation import discount_factors
+
+
+# The NZU index file has one row per calendar day
+OBSERVATIONS_PER_YEAR = 365
+
+# Number of paths generated per block when only the NPVs are kept
+DEFAULT_CHUNK_PATHS = 50000
+
+
+class GBMParams(NamedTuple):
+    """Geometric Brownian motion with annual drift `mu` and volatility `sigma`"""
+    mu: float
+    sigma: float
+
+
+class MeanRevertingParams(NamedTuple):
+    """Ornstein-Uhlenbeck process on log price reverting to `theta` at speed `kappa`"""
+    kappa: float
+    theta: float
+    sigma: float
+
+
+def calibrate_gbm(prices, periods_per_year=OBSERVATIONS_PER_YEAR, elapsed=None):
+    """Fit annualised GBM drift and volatility to a price series.
+
+    `elapsed` optionally gives the number of periods spanned by each return
+    (e.g. days between traded days), so returns across no-trade gaps are
+    scaled by their length instead of counted as one-day moves.
+    """
+    log_returns = np.diff(np.log(np.asarray(prices, dtype=float)))
+    if elapsed is None:
+        sigma = log_returns.std(ddof=1) * np.sqrt(periods_per_year)
+        mu = log_returns.mean() * periods_per_year + 0.5 * sigma ** 2
+        return GBMParams(float(mu), float(sigma))
+
+    elapsed = np.asarray(elapsed, dtype=float)
+    drift = log_returns.sum() / elapsed.sum()
+    variance = ((log_returns - drift * elapsed) ** 2 / elapsed).sum() / (len(log_returns) - 1)
+    sigma = np.sqrt(variance * periods_per_year)
+    mu = drift * periods_per_year + 0.5 * sigma ** 2
+    return GBMParams(float(mu), float(sigma))
+
+
+def _mean_reverting_fit(log_prices, elapsed, speed):
+    """Profile fit of a mean-reverting log price at a per-period reversion `speed`.
+
+    Over a gap of `elapsed` periods the AR(1) slope is `exp(-speed * elapsed)`
+    and the innovation variance is `1 - slope**2` times the stationary
+    variance. Returns `(negative log-likelihood + const, theta, stationary variance)`.
+    """
+    x, y = log_prices[:-1], log_prices[1:]
+    pull = -np.expm1(-speed * elapsed)
+    scale = -np.expm1(-2 * speed * elapsed)
+    moved = y - (1 - pull) * x
+    theta = np.sum(pull * moved / scale) / np.sum(pull * pull / scale)
+    variance = np.mean((moved - theta * pull) ** 2 / scale)
+    return len(x) * np.log(variance) + np.log(scale).sum(), theta, variance
+
+
+def calibrate_mean_reverting(prices, periods_per_year=OBSERVATIONS_PER_YEAR, elapsed=None):
+    """Fit an annualised mean-reverting log-price process via AR(1) regression.
+
+    With `elapsed` (periods spanned by each step, as in `calibrate_gbm`) the
+    slope and noise of each step depend on its gap, so the fit maximises the
+    exact Gaussian likelihood over the reversion speed instead.
+    """
+    log_prices = np.log(np.asarray(prices, dtype=float))
+    if elapsed is not None:
+        return _calibrate_mean_reverting_gaps(log_prices, np.asarray(elapsed, dtype=float),
+                                              periods_per_year)
+    x, y = log_prices[:-1], log_prices[1:]
+    b = np.cov(x, y, ddof=1)[0, 1] / x.var(ddof=1)
+    if not 0 < b < 1:
+        raise ValueError(f"Price series shows no mean reversion (AR(1) slope {b:.4f})")
+    a = y.mean() - b * x.mean()
+    residual_sd = (y - a - b * x).std(ddof=2)
+
+    kappa = -np.log(b) * periods_per_year
+    theta = a / (1 - b)
+    sigma = residual_sd * np.sqrt(2 * kappa / (1 - b ** 2))
+    return MeanRevertingParams(float(kappa), float(theta), float(sigma))
+
+
+def _calibrate_mean_reverting_gaps(log_prices, elapsed, periods_per_year):
+    # Coarse log-spaced scan of the per-period speed, then golden-section refinement
+    speeds = np.logspace(-6, 1, 141)
+    losses = [_mean_reverting_fit(log_prices, elapsed, speed)[0] for speed in speeds]
+    best = int(np.argmin(losses))
+    if best == 0:
+        raise ValueError("Price series shows no mean reversion")
+    lo, hi = np.log(speeds[best - 1]), np.log(speeds[min(best + 1, len(speeds) - 1)])
+    ratio = (np.sqrt(5) - 1) / 2
+    for _ in range(60):
+        a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        if _mean_reverting_fit(log_prices, elapsed, np.exp(a))[0] < \
+                _mean_reverting_fit(log_prices, elapsed, np.exp(b))[0]:
+            hi = b
+        else:
+            lo = a
+    speed = np.exp((lo + hi) / 2)
+    _, theta, variance = _mean_reverting_fit(log_prices, elapsed, speed)
+
+    kappa = speed * periods_per_year
+    sigma = np.sqrt(2 * kappa * variance)
+    return MeanRevertingParams(float(kappa), float(theta), float(sigma))
+
+
+def calibrate_from_index(column="ECMI", model="gbm", path=NZU_INDEX_CSV):
+    """Calibrate a price process on one column of the NZU index file.
+
+    Non-positive prices are masked out: for `Daily VWAP` these are the days
+    with no trades, while ECMI and ECQI are quoted every day and keep all
+    rows. Steps across masked gaps are weighted by the days elapsed in both
+    models. Returns `(params, last_price)` so paths can start from the
+    latest quote.
+    """
+    series = load_price_series(column, path)
+    prices = series.valid_values()
+    elapsed = series.elapsed_days()
+    if model == "gbm":
+        params = calibrate_gbm(prices, elapsed=elapsed)
+    elif model == "mean_reverting":
+        params = calibrate_mean_reverting(prices, elapsed=elapsed)
+    else:
+        raise ValueError(f"Unknown price model: {model}")
+    return params, float(prices[-1])
+
+
+def simulate_price_paths(params, s0, n_years, n_paths, rng=None):
+    """Simulate annual carbon prices for years 1..n_years as an (n_paths x n_years) block"""
+    rng = np.random.default_rng(rng)
+    paths = rng.standard_normal((n_paths, n_years))
+
+    if isinstance(params, GBMParams):
+        paths *= params.sigma
+        paths += params.mu - 0.5 * params.sigma ** 2
+        np.cumsum(paths, axis=1, out=paths)
+        paths += np.log(s0)
+    elif isinstance(params, MeanRevertingParams):
+        decay = np.exp(-params.kappa)
+        step_sd = params.sigma * np.sqrt((1 - decay ** 2) / (2 * params.kappa))
+        log_price = np.full(n_paths, np.log(s0))
+        for year in range(n_years):
+            log_price = params.theta + (log_price - params.theta) * decay + step_sd * paths[:, year]
+            paths[:, year] = log_price
+    else:
+        raise TypeError(f"Unsupported price model parameters: {type(params).__name__}")
+
+    return np.exp(paths, out=paths)
+
+
+def iter_revenue_npv_chunks(params, s0, area_hectares, sequestration_rate, project_years,
+                            discount_rate, n_paths, rng=None, chunk_size=DEFAULT_CHUNK_PATHS):
+    """Yield NPVs of `carbon_revenue_model` for blocks of at most `chunk_size` simulated paths"""
+    rng = np.random.default_rng(rng)
+    yearly_sequestration = area_hectares * sequestration_rate
+    factors = discount_factors(discount_rate, project_years)
+
+    for start in range(0, n_paths, chunk_size):
+        paths = simulate_price_paths(params, s0, project_years, min(chunk_size, n_paths - start), rng)
+        yield yearly_sequestration * (paths @ factors)
+
+
+def simulate_revenue_npv(params, s0, area_hectares, sequestration_rate, project_years,
+                         discount_rate, n_paths, rng=None, chunk_size=DEFAULT_CHUNK_PATHS):
+    """NPV distribution of `carbon_revenue_model` under simulated carbon prices.
+
+    Paths are generated in blocks of `chunk_size` and reduced to NPVs straight
+    away, so only one block of paths is held in memory at a time.
+    """
+    chunks = list(iter_revenue_npv_chunks(
+        params, s0, area_hectares, sequestration_rate, project_years,
+        discount_rate, n_paths, rng, chunk_size))
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+
+class StreamingStats:
+    """Running mean/variance and an approximate quantile sketch in constant memory.
+
+    Chunks are merged with the parallel (Chan et al.) mean/variance update.
+    Quantiles come from a fixed number of equal-width bins whose range doubles
+    (merging neighbouring bins) whenever a chunk falls outside it, so the
+    quantile error is bounded by one bin width of the observed range.
+    """
+
+    def __init__(self, n_bins=4096):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._counts = np.zeros(n_bins, dtype=np.int64)
+        self._lo = None
+        self._width = None
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        if not np.isfinite(values).all():
+            raise ValueError("StreamingStats only accepts finite values")
+
+        n, mean = values.size, values.mean()
+        m2 = np.sum((values - mean) ** 2)
+        delta = mean - self.mean
+        total = self.count + n
+        self.mean += delta * n / total
+        self._m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        self._add_to_sketch(values)
+        return self
+
+    def _add_to_sketch(self, values):
+        n_bins = self._counts.size
+        lo, hi = values.min(), values.max()
+        if self._lo is None:
+            self._lo = lo
+            self._width = max(hi - lo, abs(lo) * 1e-9, 1e-9) / n_bins * (1 + 1e-9)
+
+        # Double the covered range until the chunk fits
+        while lo < self._lo or hi >= self._lo + self._width * n_bins:
+            merged = self._counts.reshape(-1, 2).sum(axis=1)
+            self._counts[:] = 0
+            if lo < self._lo:
+                self._counts[n_bins // 2:] = merged
+                self._lo -= self._width * n_bins
+            else:
+                self._counts[:n_bins // 2] = merged
+            self._width *= 2
+
+        idx = ((values - self._lo) / self._width).astype(np.int64)
+        self._counts += np.bincount(np.clip(idx, 0, n_bins - 1), minlength=n_bins)
+
+    def quantile(self, q):
+        """Approximate quantile(s) for q in [0, 1], interpolating within bins; NaN when empty"""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan)[()]
+        cumulative = np.cumsum(self._counts)
+        targets = np.asarray(q, dtype=float) * self.count
+        bins = np.minimum(np.searchsorted(cumulative, targets), self._counts.size - 1)
+        below = cumulative[bins] - self._counts[bins]
+        within = (targets - below) / np.maximum(self._counts[bins], 1)
+        values = self._lo + (bins + within) * self._width
+        return np.clip(values, self.min, self.max)
+
+    def summary(self):
+        """Count, moments, range and 5/50/95% quantiles; statistics are NaN when empty"""
+        p5, p50, p95 = self.quantile([0.05, 0.5, 0.95])
+        if self.count == 0:
+            return {"count": 0, "mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan,
+                    "p5": p5, "p50": p50, "p95": p95}
+        return {"count": self.count, "mean": self.mean, "std": self.std,
+                "min": self.min, "max": self.max, "p5": p5, "p50": p50, "p95": p95}
+
+
+def stream_revenue_npv(params, s0, area_hectares, sequestration_rate, project_years,
+                       discount_rate, n_paths, rng=None, chunk_size=DEFAULT_CHUNK_PATHS):
+    """Summarise the NPV distribution without keeping the per-path NPVs.
+
+    Memory stays at one chunk of paths plus a fixed-size sketch whatever
+    `n_paths` is. Returns the filled `StreamingStats`.
+    """
+    stats = StreamingStats()
+    for npv in iter_revenue_npv_chunks(params, s0, area_hectares, sequestration_rate,
+                                       project_years, discount_rate, n_paths, rng, chunk_size):
+        stats.update(npv)
+    return stats
@@ -0,0 +1,389 @@
+import io
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from numpy.lib import format as npy_format
+
+try:
+    import fcntl
+except ImportError:  # Windows: cache writers are not serialised across processes
+    fcntl = None
+
+from price_series import PriceSeries
+
+
+# Bundled NZU market index history (Date, Daily VWAP, ECMI, ECQI)
+NZU_INDEX_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "NZUindices_X7QnnIl.csv")
+
+# Index dates are written as e.g. 26-May-2024
+NZU_DATE_FORMAT = "%d-%b-%Y"
+
+# Binary column caches live next to the CSV they were built from
+CACHE_DIR_NAME = ".nzu_cache"
+CACHE_META_FILE = "meta.json"
+CACHE_LOCK_FILE = "lock"
+CACHE_VERSION = 3
+
+# Trailing windows (in rows, i.e. days) of the derived rolling aggregates
+AGGREGATE_WINDOWS = (7, 30)
+
+
+# Month abbreviations of NZU_DATE_FORMAT, packed as lower-case 3-byte integers
+_MONTH_CODES = np.array([
+    int.from_bytes(name.encode(), "big")
+    for name in ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+])
+_MONTH_ORDER = np.argsort(_MONTH_CODES)
+_SORTED_MONTH_CODES = _MONTH_CODES[_MONTH_ORDER]
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def parse_nzu_dates(values):
+    """Vectorized parser for `26-May-2024` style dates, returning datetime64[D].
+
+    Works on the raw bytes: single-digit days are left-padded, the month
+    abbreviation is looked up in a sorted table of packed codes, and the
+    calendar date is turned into days since the epoch with integer
+    arithmetic (Howard Hinnant's days_from_civil), with no per-row Python.
+    Raises ValueError for anything `pd.to_datetime(format=NZU_DATE_FORMAT)`
+    would reject, including over-long strings and days past the month's end.
+    """
+    # One spare byte so over-long strings stay detectable after the cast
+    raw = np.asarray(values).astype("S12")
+    if raw.size == 0:
+        return np.empty(0, dtype="datetime64[D]")
+    lengths = np.char.str_len(raw)
+    chars = raw.view(np.uint8).reshape(-1, 12)[:, :11].astype(np.int64)
+
+    # Left-pad single-digit days ("1-Jun-2024") to the fixed layout
+    short = lengths == 10
+    chars[short] = np.concatenate([np.full((short.sum(), 1), ord("0")), chars[short, :10]], axis=1)
+
+    digits = chars[:, [0, 1, 7, 8, 9, 10]] - ord("0")
+    valid = ((lengths == 10) | (lengths == 11)) & (chars[:, 2] == ord("-")) & (chars[:, 6] == ord("-"))
+    valid &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+    code = ((chars[:, 3] | 0x20) << 16) | ((chars[:, 4] | 0x20) << 8) | (chars[:, 5] | 0x20)
+    slot = np.minimum(np.searchsorted(_SORTED_MONTH_CODES, code), 11)
+    valid &= _SORTED_MONTH_CODES[slot] == code
+    month = _MONTH_ORDER[slot] + 1
+
+    day = digits[:, 0] * 10 + digits[:, 1]
+    year = digits[:, 2] * 1000 + digits[:, 3] * 100 + digits[:, 4] * 10 + digits[:, 5]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    valid &= (year >= 1) & (day >= 1) & (day <= _DAYS_IN_MONTH[month - 1] + (leap & (month == 2)))
+    if not valid.all():
+        raise ValueError(f"Unparseable date {raw[~valid][0].decode(errors='replace')!r}, "
+                         f"expected format like 26-May-2024")
+
+    # days_from_civil: shift the year to start in March so leap days fall last
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return (era * 146097 + day_of_era - 719468).astype("datetime64[D]")
+
+
+def benchmark_date_parsing(n_rows=1_000_000, path=NZU_INDEX_CSV, repeat=3):
+    """Time parse_nzu_dates against pandas with an explicit and an inferred format"""
+    import timeit
+
+    dates = pd.read_csv(path, usecols=["Date"])["Date"].to_numpy(dtype=str)
+    sample = np.resize(dates, n_rows)
+    series = pd.Series(sample)
+    expected = parse_nzu_dates(sample)
+    assert (pd.to_datetime(series, format=NZU_DATE_FORMAT).to_numpy().astype("datetime64[D]")
+            == expected).all()
+
+    candidates = {
+        "parse_nzu_dates": lambda: parse_nzu_dates(sample),
+        "pandas explicit format": lambda: pd.to_datetime(series, format=NZU_DATE_FORMAT),
+        # Plain inference guesses "%d-%B-%Y" from "May" and fails, so infer per element
+        "pandas inferred format": lambda: pd.to_datetime(series, format="mixed"),
+    }
+    return {name: min(timeit.repeat(fn, number=1, repeat=repeat)) for name, fn in candidates.items()}
+
+
+def _column_file(column):
+    return re.sub(r"\W+", "_", column).strip("_").lower() + ".npy"
+
+
+def _cache_dir(path):
+    csv_dir, csv_name = os.path.split(os.path.abspath(path))
+    return os.path.join(csv_dir, CACHE_DIR_NAME, os.path.splitext(csv_name)[0])
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {"version": CACHE_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_csv_columns(path):
+    """Parse the CSV into `Date` as int64 days since 1970-01-01 plus float64 value columns"""
+    df = pd.read_csv(path, dtype={"Date": str})
+    dates = parse_nzu_dates(df["Date"].to_numpy(dtype=str))
+    order = np.argsort(dates, kind="stable")
+    columns = {"Date": dates[order].astype(np.int64)}
+    for column in df.columns.drop("Date"):
+        columns[column] = df[column].to_numpy(dtype=np.float64)[order]
+    return columns
+
+
+def _aggregates(columns, windows=AGGREGATE_WINDOWS):
+    """Trailing rolling mean and daily log-return volatility of every value column.
+
+    No-trade days (non-positive prices) are skipped rather than averaged in
+    as zeros; entries without a full window, or whose window holds too few
+    traded days, are NaN. Each output row depends only on the last
+    `max(windows) + 1` input rows, which is what makes appends incremental
+    (identical to a full rebuild up to floating-point rounding).
+    """
+    aggregates = {}
+    for column, values in columns.items():
+        if column == "Date":
+            continue
+        series = PriceSeries(columns["Date"], values)
+        for window in windows:
+            aggregates[f"{column} mean {window}d"] = series.rolling_mean(window)
+            aggregates[f"{column} volatility {window}d"] = series.rolling_volatility(window)
+    return aggregates
+
+
+@contextmanager
+def _cache_lock(path, shared=False):
+    """Hold the cache lock of `path` across processes: shared to read, exclusive to write"""
+    cache_dir = _cache_dir(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, CACHE_LOCK_FILE), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+
+
+def _replace_file(path, write, mode="wb"):
+    """Write through a temporary file unique to this writer, then move it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _save_npy(path, values):
+    _replace_file(path, lambda f: np.save(f, np.ascontiguousarray(values)))
+
+
+def _append_npy(path, values):
+    """Append rows to a 1-D .npy file in place by patching the shape in its header.
+
+    np.save pads headers to a 64-byte boundary, so the longer shape almost
+    always fits; otherwise the file is rewritten.
+    """
+    with open(path, "r+b") as f:
+        npy_format.read_magic(f)
+        shape, fortran_order, dtype = npy_format.read_array_header_1_0(f)
+        header_len = f.tell()
+        header = io.BytesIO()
+        npy_format.write_array_header_1_0(header, {
+            "descr": npy_format.dtype_to_descr(dtype),
+            "fortran_order": fortran_order,
+            "shape": (shape[0] + len(values),),
+        })
+        if len(header.getvalue()) == header_len:
+            f.seek(0)
+            f.write(header.getvalue())
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+            return
+    _save_npy(path, np.concatenate([np.load(path), values]))
+
+
+def _write_meta(cache_dir, signature, columns, aggregates):
+    # The metadata is written last so a partially written cache is never trusted
+    meta = {**signature, "columns": list(columns), "aggregates": list(aggregates)}
+    _replace_file(os.path.join(cache_dir, CACHE_META_FILE), lambda f: json.dump(meta, f), "w")
+
+
+def _write_cache(cache_dir, columns, signature):
+    os.makedirs(cache_dir, exist_ok=True)
+    aggregates = _aggregates(columns)
+    for column, values in {**columns, **aggregates}.items():
+        _save_npy(os.path.join(cache_dir, _column_file(column)), values)
+    _write_meta(cache_dir, signature, columns, aggregates)
+
+
+def _read_meta(path):
+    """Cache metadata for `path` if the cache is current and complete, else None"""
+    cache_dir = _cache_dir(path)
+    try:
+        with open(os.path.join(cache_dir, CACHE_META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    signature = _source_signature(path)
+    if {k: meta.get(k) for k in signature} != signature:
+        return None
+    names = meta.get("columns", []) + meta.get("aggregates", [])
+    if not all(os.path.exists(os.path.join(cache_dir, _column_file(name))) for name in names):
+        return None
+    return meta
+
+
+def _map_columns(cache_dir, names):
+    return {name: np.load(os.path.join(cache_dir, _column_file(name)), mmap_mode="r") for name in names}
+
+
+def _current_meta(path):
+    """Cache metadata for `path`, rebuilding a stale cache first; needs the exclusive lock"""
+    meta = _read_meta(path)
+    if meta is None:
+        _write_cache(_cache_dir(path), _read_csv_columns(path), _source_signature(path))
+        meta = _read_meta(path)
+    return meta
+
+
+def _load_cached(path, kind):
+    """Map the `columns` or `aggregates` of the cache, rebuilding it once if stale.
+
+    Readers share the lock; a rebuild takes it exclusively and re-checks the
+    cache, so workers starting together build it once instead of racing.
+    If the cache cannot be written (e.g. a read-only directory), the CSV is
+    parsed into memory instead.
+    """
+    try:
+        with _cache_lock(path, shared=True):
+            meta = _read_meta(path)
+            if meta is not None:
+                return _map_columns(_cache_dir(path), meta[kind])
+        with _cache_lock(path):
+            return _map_columns(_cache_dir(path), _current_meta(path)[kind])
+    except OSError:
+        if not os.path.exists(path):
+            raise
+        columns = _read_csv_columns(path)
+        return columns if kind == "columns" else _aggregates(columns)
+
+
+def load_nzu_columns(path=NZU_INDEX_CSV):
+    """Load the NZU index history as read-only memory-mapped columns.
+
+    The first load parses the CSV and writes one `.npy` file per column
+    (`Date` as int64 days since 1970-01-01, the rest float64) to a cache
+    directory next to it. Later loads map those files without copying or
+    parsing, and the cache is rebuilt whenever the CSV's size or mtime
+    changes or a column file is missing. Where the cache cannot be written
+    the columns are parsed into memory on every load. Returns a dict of
+    column name to array, sorted by date.
+    """
+    return _load_cached(path, "columns")
+
+
+def load_nzu_aggregates(path=NZU_INDEX_CSV):
+    """Memory-mapped rolling mean and volatility columns maintained alongside the cache"""
+    return _load_cached(path, "aggregates")
+
+
+def load_price_series(column="Daily VWAP", path=NZU_INDEX_CSV):
+    """One index column as a PriceSeries, masking days without trades"""
+    columns = load_nzu_columns(path)
+    return PriceSeries(columns["Date"], columns[column])
+
+
+def _format_value(value):
+    return np.format_float_positional(value, trim="-")
+
+
+def _ingest_columns(new, path):
+    """Body of `ingest_nzu_file`, run under the exclusive cache lock.
+
+    Holding the lock throughout keeps loaders from rebuilding the cache from
+    a CSV that already has the new rows while the .npy files do not yet.
+    """
+    meta = _current_meta(path)
+    history = _map_columns(_cache_dir(path), meta["columns"])
+    if list(new) != list(history):
+        raise ValueError(f"Columns {list(new)} do not match the index history {list(history)}")
+
+    # Keep the last row per date, then only dates after the stored history
+    dates = new["Date"]
+    keep = np.append(dates[1:] != dates[:-1], True)[:len(dates)]
+    if len(history["Date"]):
+        keep &= dates > history["Date"][-1]
+    new = {column: values[keep] for column, values in new.items()}
+    count = len(new["Date"])
+    if count == 0:
+        return 0
+
+    # Append to the CSV in its own text format
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+        else:
+            needs_newline = False
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        if needs_newline:
+            f.write("\n")
+        for i in range(count):
+            day = new["Date"][i].astype("datetime64[D]").item().strftime(NZU_DATE_FORMAT)
+            values = (_format_value(new[column][i]) for column in new if column != "Date")
+            f.write(",".join([day, *values]) + "\n")
+
+    # Extend the raw columns, then the aggregates from the tail they depend on
+    cache_dir = _cache_dir(path)
+    tail_len = max(AGGREGATE_WINDOWS) + 1
+    combined = {column: np.concatenate([history[column][-tail_len:], new[column]]) for column in history}
+    aggregates = {name: values[-count:] for name, values in _aggregates(combined).items()}
+    for name, values in {**new, **aggregates}.items():
+        _append_npy(os.path.join(cache_dir, _column_file(name)), values)
+    _write_meta(cache_dir, _source_signature(path), meta["columns"], meta["aggregates"])
+    return count
+
+
+def ingest_nzu_file(new_path, path=NZU_INDEX_CSV):
+    """Append the rows of a daily NZU index drop that are newer than the history.
+
+    Rows dated on or before the last stored date (overlapping ranges) are
+    skipped, and duplicate dates within the drop keep their last row. New
+    rows are appended to the CSV, the binary column cache and the rolling
+    aggregates in place, so the cost is O(new rows + largest window) rather
+    than a re-parse of the full history. The whole update holds the cache's
+    exclusive lock. Returns the number of rows added.
+    """
+    new = _read_csv_columns(new_path)
+    with _cache_lock(path):
+        return _ingest_columns(new, path)
+
+
+def load_nzu_indices(path=NZU_INDEX_CSV):
+    """Load the NZU index history as a DataFrame sorted by Date"""
+    columns = load_nzu_columns(path)
+    df = pd.DataFrame({column: values for column, values in columns.items() if column != "Date"})
+    df.insert(0, "Date", columns["Date"].astype("datetime64[D]").astype("datetime64[ns]"))
+    return df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingest daily NZU index drops into the bundled history")
+    parser.add_argument("drops", nargs="*", help="CSV files with new daily rows")
+    parser.add_argument("--bench", type=int, metavar="ROWS",
+                        help="Benchmark date parsing on this many rows instead")
+    args = parser.parse_args()
+
+    if args.bench:
+        for name, seconds in benchmark_date_parsing(args.bench).items():
+            print(f"{name:>24}: {seconds * 1000:8.1f} ms")
+    for drop in args.drops:
+        print(f"{drop}: appended {ingest_nzu_file(drop)} new rows")
@@ -0,0 +1,133 @@
+import numpy as np
+
+
+def window_array(windows):
+    """Rolling window lengths as a column vector, plus whether a single window was given"""
+    column = np.atleast_1d(np.asarray(windows, dtype=np.int64))[:, None]
+    if (column < 1).any():
+        raise ValueError("Rolling windows must be at least one day")
+    return column, np.ndim(windows) == 0
+
+
+class _PrefixSums:
+    """Prefix count, sum and sum of squares over the valid entries of one series.
+
+    Values are shifted by their mean before accumulating so the sum of
+    squares does not cancel catastrophically on price-level series.
+    """
+
+    def __init__(self, values, valid):
+        self.shift = float(np.mean(values[valid])) if valid.any() else 0.0
+        x = np.where(valid, values - self.shift, 0.0)
+        self.count = np.concatenate([[0], np.cumsum(valid)])
+        self.sum = np.concatenate([[0.0], np.cumsum(x)])
+        self.squares = np.concatenate([[0.0], np.cumsum(x * x)])
+
+    def totals(self, prefix, windows):
+        """Trailing-window totals for every (window, day) pair, NaN before a full window"""
+        end = np.arange(1, len(prefix))
+        start = end - windows
+        out = (prefix[end] - prefix[np.maximum(start, 0)]).astype(float)
+        out[start < 0] = np.nan
+        return out
+
+    def mean(self, windows):
+        counts = self.totals(self.count, windows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.totals(self.sum, windows) / counts + self.shift
+        return np.where(counts > 0, mean, np.nan)
+
+    def std(self, windows, ddof=1):
+        counts = self.totals(self.count, windows)
+        sums = self.totals(self.sum, windows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (self.totals(self.squares, windows) - sums * sums / counts) / (counts - ddof)
+        return np.where(counts > ddof, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+
+class PriceSeries:
+    """Daily price column plus a packed validity bitmask of the days that actually traded.
+
+    `Daily VWAP` is 0 on days with no trades; those days are masked rather
+    than treated as a price of zero. The values array is kept as given
+    (e.g. a read-only memory map) and never rewritten; filled views and
+    masked statistics are computed on demand.
+
+    Rolling statistics come from prefix sums of the prices and log returns,
+    built once on first use, so each window costs O(n) and any number of
+    windows share them. They accept one window or a sequence: a sequence
+    gives a `(len(windows), n)` array and a single window its row as a view.
+    Entries are NaN until a full window is available, or when the window
+    has too few traded days.
+    """
+
+    def __init__(self, dates, values, valid=None):
+        self.dates = dates
+        self.values = values
+        valid = np.asarray(values) > 0 if valid is None else np.asarray(valid, dtype=bool)
+        self._valid_bits = np.packbits(valid)
+        self._prefix_sums = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def valid(self):
+        """Boolean mask of traded days, unpacked from the bitmask"""
+        return np.unpackbits(self._valid_bits, count=len(self)).view(bool)
+
+    def valid_values(self):
+        """Prices on traded days only"""
+        return np.asarray(self.values)[self.valid]
+
+    def elapsed_days(self):
+        """Days between consecutive traded days, aligned with `valid_values()[1:]`"""
+        return np.diff(np.asarray(self.dates)[self.valid])
+
+    def forward_filled(self):
+        """Each day's most recent traded price (NaN before the first trade)"""
+        valid = self.valid
+        last = np.maximum.accumulate(np.where(valid, np.arange(len(self)), -1))
+        filled = np.asarray(self.values, dtype=float)[np.maximum(last, 0)]
+        filled[last < 0] = np.nan
+        return filled
+
+    def imputed(self, reference):
+        """Traded prices, with no-trade days taken from a reference series such as ECMI"""
+        return np.where(self.valid, self.values, reference)
+
+    def log_returns(self):
+        """Day-over-day log returns, NaN unless both days traded"""
+        values = np.asarray(self.values, dtype=float)
+        valid = self.valid
+        returns = np.full(len(self), np.nan)
+        both = valid[1:] & valid[:-1]
+        returns[1:][both] = np.log(values[1:][both] / values[:-1][both])
+        return returns
+
+    def _sums(self, kind):
+        if kind not in self._prefix_sums:
+            if kind == "prices":
+                self._prefix_sums[kind] = _PrefixSums(np.asarray(self.values, dtype=float), self.valid)
+            else:
+                returns = self.log_returns()
+                self._prefix_sums[kind] = _PrefixSums(returns, ~np.isnan(returns))
+        return self._prefix_sums[kind]
+
+    def rolling_mean(self, windows):
+        """Rolling mean price over the traded days of each window"""
+        windows, single = window_array(windows)
+        out = self._sums("prices").mean(windows)
+        return out[0] if single else out
+
+    def rolling_std(self, windows, ddof=1):
+        """Rolling standard deviation of the price over the traded days of each window"""
+        windows, single = window_array(windows)
+        out = self._sums("prices").std(windows, ddof)
+        return out[0] if single else out
+
+    def rolling_volatility(self, windows):
+        """Rolling standard deviation of daily log returns between consecutive traded days"""
+        windows, single = window_array(windows)
+        out = self._sums("returns").std(windows)
+        return out[0] if single else out
@@ -0,0 +1,97 @@
+import threading
+from datetime import datetime
+
+
+# Postgres function defined in sql/project_id_allocator.sql
+RESERVE_IDS_RPC = "reserve_project_ids"
+
+
+def get_date_prefix():
+    """Today's project ID prefix in YYMMDD format"""
+    return datetime.now().strftime("%y%m%d")
+
+
+def format_project_id(prefix, number):
+    return f"{prefix}-req{number}"
+
+
+def parse_project_id(project_id):
+    """Split `YYMMDD-reqN` into (prefix, N), or return None if it does not match"""
+    prefix, sep, number = project_id.partition("-req")
+    if not sep or not number.isdigit():
+        return None
+    return prefix, int(number)
+
+
+class IdBlock:
+    """Contiguous range of reserved project numbers, handed out locally in order"""
+
+    def __init__(self, prefix, first, last):
+        self.prefix = prefix
+        self.first = first
+        self.last = last
+        self._next = first
+
+    def __len__(self):
+        return self.last - self.first + 1
+
+    def __iter__(self):
+        return (format_project_id(self.prefix, n) for n in range(self.first, self.last + 1))
+
+    @property
+    def remaining(self):
+        return self.last - self._next + 1
+
+    def next_id(self):
+        if self._next > self.last:
+            raise ValueError(f"ID block {self.prefix}-req{self.first}..{self.last} is exhausted")
+        project_id = format_project_id(self.prefix, self._next)
+        self._next += 1
+        return project_id
+
+
+class SupabaseIdAllocator:
+    """Hands out project IDs from the database counter in one RPC round trip"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def reserve_block(self, count, prefix=None):
+        """Reserve `count` consecutive numbers for `prefix` in a single call"""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        prefix = prefix or get_date_prefix()
+        response = self.client.rpc(RESERVE_IDS_RPC, {"p_prefix": prefix, "p_count": count}).execute()
+        last = int(response.data)
+        return IdBlock(prefix, last - count + 1, last)
+
+    def next_id(self, prefix=None):
+        return self.reserve_block(1, prefix).next_id()
+
+
+class LocalIdAllocator:
+    """Thread-safe in-process counter store with the same interface, for offline use.
+
+    Optionally seeded from existing project IDs so it never reissues them.
+    """
+
+    def __init__(self, existing_ids=()):
+        self._lock = threading.Lock()
+        self._counters = {}
+        for project_id in existing_ids:
+            parsed = parse_project_id(project_id)
+            if parsed:
+                prefix, number = parsed
+                self._counters[prefix] = max(self._counters.get(prefix, 0), number)
+
+    def reserve_block(self, count, prefix=None):
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        prefix = prefix or get_date_prefix()
+        with self._lock:
+            last = self._counters.get(prefix, 0) + count
+            self._counters[prefix] = last
+        return IdBlock(prefix, last - count + 1, last)
+
+    def next_id(self, prefix=None):
+        return self.reserve_block(1, prefix).next_id()
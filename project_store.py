@@ -0,0 +1,290 @@
+import csv
+import io
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+import pandas as pd
+from postgrest.exceptions import APIError
+
+from project_ids import parse_project_id
+
+
+# Choices offered by the New Project page for the projects table
+PROJECT_TYPES = ["REDD+", "ARR", "PDD", "Other"]
+PROJECT_STATUSES = ["Draft", "Submitted", "Approved"]
+
+# Rows sent per request by the bulk insert path
+DEFAULT_BATCH_SIZE = 500
+
+# Columns each view reads from the projects table
+LOOKUP_COLUMNS = ("project_id", "project_type_category", "project_status", "project_submission_date")
+
+# Upper bound on IDs per `in` filter, keeping request URLs well under server limits
+MAX_IDS_PER_REQUEST = 200
+
+# Rows per page when streaming the whole table; pages are keyed on these columns
+DEFAULT_PAGE_SIZE = 1000
+KEYSET_COLUMNS = ("project_submission_date", "project_id")
+
+# Defaults for the Project Lookup read-through cache
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 300
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire `ttl` seconds after being stored"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class BulkInsertResult(NamedTuple):
+    """Outcome of a bulk insert, per project ID"""
+    inserted: list
+    conflicts: list
+    errors: list
+
+
+def validate_project_record(record):
+    """Return an error message for a record the New Project page could not produce"""
+    if record.get("project_type_category") not in PROJECT_TYPES:
+        return f"Invalid project_type_category: {record.get('project_type_category')!r}"
+    if record.get("project_status") not in PROJECT_STATUSES:
+        return f"Invalid project_status: {record.get('project_status')!r}"
+    return None
+
+
+def _project(row, columns):
+    return None if row is None else {column: row.get(column) for column in columns}
+
+
+def cached_project(cache, project_id, columns=LOOKUP_COLUMNS):
+    """Serve one project lookup from a read-through cache.
+
+    Returns `(hit, row)`. A cached miss is a hit with `row` None, and a
+    cached row only counts as a hit for a subset of its columns.
+    """
+    row = _MISSING if cache is None else cache.get(project_id, _MISSING)
+    if row is _MISSING or (row is not None and not set(columns) <= row.keys()):
+        return False, None
+    return True, _project(row, columns)
+
+
+def cached_projects(cache, project_ids, columns=LOOKUP_COLUMNS):
+    """Split a multi-project lookup into cached rows and the IDs still to query.
+
+    Returns `(rows, to_fetch)`, with duplicate IDs removed; IDs cached as
+    missing appear in neither.
+    """
+    rows, to_fetch = {}, []
+    for project_id in dict.fromkeys(project_ids):
+        hit, row = cached_project(cache, project_id, columns)
+        if not hit:
+            to_fetch.append(project_id)
+        elif row is not None:
+            rows[project_id] = row
+    return rows, to_fetch
+
+
+def cache_fetched(cache, project_ids, fetched):
+    """Store the rows of a multi-project query, recording the IDs it did not find"""
+    if cache is not None:
+        for project_id in project_ids:
+            cache.set(project_id, fetched.get(project_id))
+
+
+def fetch_project(client, project_id, columns=LOOKUP_COLUMNS, cache=None):
+    """Fetch the given columns of one project row by ID, or None if it does not exist.
+
+    With a `cache`, repeated lookups (including misses) are served from it
+    until they expire or a write invalidates the ID. A cached row satisfies
+    any request for a subset of its columns.
+    """
+    hit, row = cached_project(cache, project_id, columns)
+    if hit:
+        return row
+
+    response = client.table("projects").select(",".join(columns)).eq("project_id", project_id).execute()
+    row = response.data[0] if response.data else None
+
+    if cache is not None:
+        cache.set(project_id, row)
+    return row
+
+
+def fetch_projects(client, project_ids, columns=LOOKUP_COLUMNS, cache=None):
+    """Fetch the given columns for many projects with one `in` query per batch of IDs.
+
+    IDs already in `cache` are served from it and only the rest are queried.
+    Returns a dict of project ID to row; IDs that do not exist are absent.
+    """
+    if "project_id" not in columns:
+        columns = ("project_id",) + tuple(columns)
+
+    rows, to_fetch = cached_projects(cache, project_ids, columns)
+    for start in range(0, len(to_fetch), MAX_IDS_PER_REQUEST):
+        batch = to_fetch[start:start + MAX_IDS_PER_REQUEST]
+        response = client.table("projects").select(",".join(columns)).in_("project_id", batch).execute()
+        fetched = {row["project_id"]: row for row in response.data or []}
+        rows.update(fetched)
+        cache_fetched(cache, batch, fetched)
+    return rows
+
+
+def iter_project_pages(client, columns=LOOKUP_COLUMNS, page_size=DEFAULT_PAGE_SIZE):
+    """Yield the projects table as lists of rows, oldest submission first.
+
+    Uses keyset pagination on (project_submission_date, project_id): each
+    page asks for rows strictly after the last key seen, so every request
+    costs the same however deep into the table it is and only one page is
+    held in memory. Rows without a submission date sort last, by ID.
+    """
+    columns = tuple(dict.fromkeys(KEYSET_COLUMNS + tuple(columns)))
+    last = None
+    while True:
+        query = client.table("projects").select(",".join(columns)) \
+            .order("project_submission_date", nullsfirst=False).order("project_id").limit(page_size)
+        if last is not None:
+            date, project_id = last["project_submission_date"], last["project_id"]
+            if date is None:
+                query = query.is_("project_submission_date", "null").gt("project_id", project_id)
+            else:
+                query = query.or_(f'project_submission_date.gt."{date}",'
+                                  f'and(project_submission_date.eq."{date}",project_id.gt."{project_id}"),'
+                                  'project_submission_date.is.null')
+        rows = query.execute().data or []
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def parse_project_ids(text):
+    """Project IDs from pasted text, in order and de-duplicated"""
+    tokens = (token.strip().strip('"') for token in re.split(r"[\s,;]+", text))
+    return list(dict.fromkeys(t for t in tokens if t and t != "project_id"))
+
+
+def parse_project_id_file(text):
+    """Project IDs from the first column of an uploaded CSV/TXT, in order and de-duplicated.
+
+    The first row is skipped as a header unless its first cell is itself a
+    `YYMMDD-reqN` project ID; other columns and blank cells are ignored.
+    """
+    cells = [row[0].strip() for row in csv.reader(io.StringIO(text)) if row]
+    if cells and parse_project_id(cells[0]) is None:
+        cells = cells[1:]
+    return list(dict.fromkeys(cell for cell in cells if cell))
+
+
+def bulk_insert_projects(client, records, batch_size=DEFAULT_BATCH_SIZE, allocator=None, cache=None):
+    """Insert many project records in batches, reporting conflicts per row.
+
+    `records` is a list of dicts or a DataFrame with the New Project columns
+    (`project_id`, `project_type_category`, `project_status`). Rows without a
+    `project_id` get one from `allocator.reserve_block` in a single call.
+
+    Each batch is one `ON CONFLICT DO NOTHING` upsert, so rows whose ID
+    already exists are reported in `conflicts` while the rest of the batch is
+    still written. If the database rejects a batch (an `APIError`, e.g. a
+    check constraint) it is retried row by row and the failing rows are
+    reported in `errors` as `(project_id, message)`. Transport errors such
+    as timeouts are raised, since retrying row by row would only repeat them.
+    """
+    if isinstance(records, pd.DataFrame):
+        # Drop empty cells so database defaults apply to them
+        records = [{k: v for k, v in row.items() if pd.notna(v)} for row in records.to_dict("records")]
+    records = [dict(r) for r in records]
+
+    missing = [r for r in records if not r.get("project_id")]
+    if missing:
+        if allocator is None:
+            raise ValueError(f"{len(missing)} records have no project_id and no allocator was given")
+        for record, project_id in zip(missing, allocator.reserve_block(len(missing))):
+            record["project_id"] = project_id
+
+    inserted, conflicts, errors = [], [], []
+    seen = set()
+    valid = []
+    for record in records:
+        error = validate_project_record(record)
+        if error:
+            errors.append((record["project_id"], error))
+        elif record["project_id"] in seen:
+            conflicts.append(record["project_id"])
+        else:
+            seen.add(record["project_id"])
+            valid.append(record)
+
+    for start in range(0, len(valid), batch_size):
+        batch = valid[start:start + batch_size]
+        failed = set()
+        try:
+            written = _upsert_ignoring_duplicates(client, batch)
+        except APIError:
+            # Isolate the rejected rows so the rest of the batch still lands
+            written = set()
+            for record in batch:
+                try:
+                    written |= _upsert_ignoring_duplicates(client, [record])
+                except APIError as e:
+                    failed.add(record["project_id"])
+                    errors.append((record["project_id"], str(e)))
+
+        for record in batch:
+            if record["project_id"] in written:
+                inserted.append(record["project_id"])
+            elif record["project_id"] not in failed:
+                conflicts.append(record["project_id"])
+
+    if cache is not None:
+        cache.invalidate(*inserted)
+    return BulkInsertResult(inserted, conflicts, errors)
+
+
+def _upsert_ignoring_duplicates(client, rows):
+    """Insert rows, skipping existing IDs; returns the set of IDs actually written"""
+    response = client.table("projects").upsert(
+        rows, on_conflict="project_id", ignore_duplicates=True, default_to_null=False
+    ).execute()
+    return {row["project_id"] for row in response.data or []}
@@ -0,0 +1,126 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from postgrest.exceptions import APIError
+
+from valuation import discount_factors
+
+
+# Valuation inputs used when a project row does not carry its own
+DEFAULT_VALUATION_INPUTS = {
+    "area_hectares": 1000,
+    "sequestration_rate": 5.0,
+    "project_years": 10,
+    "discount_rate": 0.1,
+}
+
+# Columns fetched for valuation: the ID plus every per-project input
+PORTFOLIO_COLUMNS = ("project_id",) + tuple(DEFAULT_VALUATION_INPUTS)
+
+
+def fetch_portfolio(client, columns=PORTFOLIO_COLUMNS):
+    """Fetch the project rows to value from the Supabase `projects` table.
+
+    PostgREST rejects unknown columns, so input columns the table does not
+    have are dropped from the query one by one; those inputs then fall back
+    to DEFAULT_VALUATION_INPUTS.
+    """
+    columns = list(columns)
+    while True:
+        try:
+            response = client.table("projects").select(",".join(columns)).execute()
+            return response.data or []
+        except APIError as e:
+            missing = re.search(r"column \w+\.(\w+) does not exist", e.message or "")
+            if e.code != "42703" or not missing or missing.group(1) not in columns[1:]:
+                raise
+            columns.remove(missing.group(1))
+
+
+def _valuation_inputs(project):
+    inputs = {k: project.get(k) for k in DEFAULT_VALUATION_INPUTS}
+    return {k: DEFAULT_VALUATION_INPUTS[k] if v is None else v for k, v in inputs.items()}
+
+
+def _value_shard(shm_name, shape, dtype, projects):
+    """Value a shard of projects against price paths held in shared memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        paths = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        try:
+            results = []
+            for project in projects:
+                inputs = _valuation_inputs(project)
+                years = int(inputs["project_years"])
+                if years > shape[1]:
+                    raise ValueError(f"Project {project.get('project_id')} runs {years} years "
+                                     f"but the price paths cover only {shape[1]}")
+                volume = inputs["area_hectares"] * inputs["sequestration_rate"]
+                npv = volume * (paths[:, :years] @ discount_factors(inputs["discount_rate"], years))
+                p5, p50, p95 = np.percentile(npv, [5, 50, 95])
+                results.append({
+                    "project_id": project.get("project_id"),
+                    "npv_mean": float(npv.mean()),
+                    "npv_p5": float(p5),
+                    "npv_p50": float(p50),
+                    "npv_p95": float(p95),
+                })
+        finally:
+            # The view must be released before the segment can be closed
+            del paths
+        return results
+    finally:
+        shm.close()
+
+
+def run_portfolio(projects, price_paths, max_workers=None, shard_size=None):
+    """Value every project under the same simulated price paths in parallel.
+
+    `price_paths` is an (n_paths x n_years) array, e.g. from
+    `monte_carlo.simulate_price_paths`. It is copied once into shared memory
+    and each worker process maps it read-only instead of receiving a pickled
+    copy. Projects are split into shards of `shard_size` (by default an even
+    split across workers). Raises ValueError if a project runs longer than
+    the paths. Returns one row of NPV statistics per project.
+    """
+    projects = list(projects)
+    if not projects:
+        return pd.DataFrame(columns=["project_id", "npv_mean", "npv_p5", "npv_p50", "npv_p95"])
+
+    max_workers = max_workers or os.cpu_count() or 1
+    shard_size = shard_size or -(-len(projects) // max_workers)
+    price_paths = np.ascontiguousarray(price_paths)
+
+    shm = shared_memory.SharedMemory(create=True, size=price_paths.nbytes)
+    try:
+        shared = np.ndarray(price_paths.shape, dtype=price_paths.dtype, buffer=shm.buf)
+        shared[:] = price_paths
+        del shared
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_value_shard, shm.name, price_paths.shape,
+                                price_paths.dtype.str, projects[i:i + shard_size])
+                for i in range(0, len(projects), shard_size)
+            ]
+            rows = [row for future in futures for row in future.result()]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    from db import get_supabase
+    from monte_carlo import calibrate_from_index, simulate_price_paths
+
+    supabase = get_supabase()
+
+    params, last_price = calibrate_from_index()
+    paths = simulate_price_paths(params, last_price, n_years=50, n_paths=100000)
+    print(run_portfolio(fetch_portfolio(supabase), paths).to_string(index=False))
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from valuation import batch_revenue_npv
+
+
+# Grid axes in model-argument order, matching the Financial Modeling sliders
+DEFAULT_AXES = {
+    "area_hectares": np.arange(100, 10001, 100),
+    "carbon_price_per_ton": np.arange(5, 51),
+    "sequestration_rate": np.arange(1.0, 10.01, 0.5),
+    "project_years": np.arange(5, 31),
+}
+
+PARAMETER_LABELS = {
+    "area_hectares": "Project Area (hectares)",
+    "carbon_price_per_ton": "Carbon Price ($/ton)",
+    "sequestration_rate": "Sequestration Rate (tons/hectare)",
+    "project_years": "Project Duration (years)",
+}
+
+METRIC_LABELS = {
+    "npv": "Net Present Value ($)",
+    "total_revenue": "Total Project Revenue ($)",
+}
+
+
+class SensitivityGrid:
+    """Carbon revenue metrics precomputed over every combination of the grid axes.
+
+    The whole grid is valued in one broadcast call to `batch_revenue_npv`;
+    afterwards heatmap slices are pure array indexing.
+    Tornado swings are valued exactly rather than snapped to the grid.
+    """
+
+    def __init__(self, discount_rate, axes=None):
+        self.discount_rate = discount_rate
+        self.axes = {name: np.asarray(values) for name, values in (axes or DEFAULT_AXES).items()}
+        # Each axis varies along its own dimension, in the order of `axes`
+        shaped = {
+            name: values.reshape([-1 if i == j else 1 for j in range(len(self.axes))])
+            for i, (name, values) in enumerate(self.axes.items())
+        }
+        area, price, rate, years = (shaped[name] for name in (
+            "area_hectares", "carbon_price_per_ton", "sequestration_rate", "project_years"))
+        npv, total_revenue = batch_revenue_npv(price, area * rate, years, discount_rate)
+        self.metrics = {"npv": npv, "total_revenue": total_revenue}
+
+    def _index(self, name, value):
+        """Position of the grid point nearest to `value` on axis `name`"""
+        return int(np.abs(self.axes[name] - value).argmin())
+
+    def slice(self, x, y, metric="npv", **point):
+        """2-D (y x x) slice of a metric with the other parameters held at `point`"""
+        index = tuple(slice(None) if n in (x, y) else self._index(n, point[n]) for n in self.axes)
+        values = self.metrics[metric][index]
+        return values.T if list(self.axes).index(x) < list(self.axes).index(y) else values
+
+    def _value(self, metric, point):
+        """Exact metric at an arbitrary parameter point, on or off the grid"""
+        npv, total_revenue = batch_revenue_npv(
+            point["carbon_price_per_ton"], point["area_hectares"] * point["sequestration_rate"],
+            point["project_years"], self.discount_rate)
+        return float({"npv": npv, "total_revenue": total_revenue}[metric])
+
+    def tornado(self, metric="npv", swing=0.2, **point):
+        """Change in the metric at base -/+ `swing` for each parameter, sorted by impact"""
+        base = self._value(metric, point)
+        rows = []
+        for name in self.axes:
+            low = self._value(metric, {**point, name: point[name] * (1 - swing)})
+            high = self._value(metric, {**point, name: point[name] * (1 + swing)})
+            rows.append({"parameter": PARAMETER_LABELS[name], "low": low - base, "high": high - base})
+        df = pd.DataFrame(rows)
+        order = (df["high"] - df["low"]).abs().sort_values().index
+        return df.loc[order].reset_index(drop=True)
+
+
+def heatmap_figure(grid, x, y, metric="npv", **point):
+    """Plotly heatmap of a metric over two parameters"""
+    return px.imshow(grid.slice(x, y, metric, **point), x=grid.axes[x], y=grid.axes[y],
+                     origin="lower", aspect="auto", color_continuous_scale="Greens",
+                     labels={"x": PARAMETER_LABELS[x], "y": PARAMETER_LABELS[y],
+                             "color": METRIC_LABELS[metric]},
+                     title=f"{METRIC_LABELS[metric]} Sensitivity")
+
+
+def tornado_figure(df, metric="npv", swing=0.2):
+    """Horizontal tornado chart from `SensitivityGrid.tornado` output"""
+    fig = go.Figure([
+        go.Bar(y=df["parameter"], x=df["low"], orientation="h", name=f"-{swing:.0%}"),
+        go.Bar(y=df["parameter"], x=df["high"], orientation="h", name=f"+{swing:.0%}"),
+    ])
+    fig.update_layout(barmode="overlay", title=f"{METRIC_LABELS[metric]} Tornado (change vs. base)",
+                      xaxis_title="Change ($)")
+    return fig
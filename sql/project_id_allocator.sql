@@ -0,0 +1,37 @@
+-- Atomic project ID allocation for the projects table.
+--
+-- Each YYMMDD prefix has one counter row. reserve_project_ids() advances it
+-- by p_count with a single upsert and returns the last number of the
+-- reserved block, so concurrent callers always receive disjoint ranges.
+-- The first call for a prefix seeds the counter from IDs already present
+-- in projects, so existing rows are never reissued; IDs whose suffix is
+-- not a plain number are ignored, as in project_ids.parse_project_id.
+
+create table if not exists project_id_counters (
+    prefix     text primary key,
+    last_value integer not null
+);
+
+create or replace function reserve_project_ids(p_prefix text, p_count integer)
+returns integer
+language sql
+volatile
+as $$
+    insert into project_id_counters as c (prefix, last_value)
+    select p_prefix,
+           coalesce(max(split_part(project_id, '-req', 2)::integer), 0) + p_count
+    from projects
+    where project_id like p_prefix || '-req%'
+      and split_part(project_id, '-req', 2) ~ '^\d+$'
+    on conflict (prefix) do update
+        set last_value = c.last_value + p_count
+    returning last_value;
+$$;
+
+create or replace function next_project_id(p_prefix text)
+returns integer
+language sql
+volatile
+as $$
+    select reserve_project_ids(p_prefix, 1);
+$$;
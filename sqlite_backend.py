@@ -0,0 +1,325 @@
+import re
+import sqlite3
+import threading
+
+from postgrest.exceptions import APIError
+
+
+# Local mirror of the Supabase tables used by the app, including the ID counter
+SCHEMA = """
+create table if not exists projects (
+    project_id              text primary key,
+    project_type_category   text,
+    project_status          text,
+    project_submission_date text not null default (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+
+create table if not exists project_id_counters (
+    prefix     text primary key,
+    last_value integer not null
+);
+"""
+
+_OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "like": "LIKE"}
+
+
+def _ident(name):
+    """Validate a table or column name before it is interpolated into SQL"""
+    if not re.fullmatch(r"[A-Za-z_]\w*", name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return name
+
+
+def _split_top_level(text):
+    """Split a PostgREST logic expression on commas outside parentheses and quotes"""
+    parts, current, depth, quoted = [], [], 0, False
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current))
+    return parts
+
+
+def _parse_condition(text):
+    """Translate one PostgREST filter such as `a.gt."x"` or `and(...)` into SQL"""
+    group = re.fullmatch(r"(and|or)\((.*)\)", text, re.S)
+    if group:
+        return _parse_group(group.group(2), group.group(1).upper())
+    column, op, value = text.split(".", 2)
+    if op == "is":
+        return _is_clause(column, value), []
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    return f"{_ident(column)} {_OPERATORS[op]} ?", [value]
+
+
+def _is_clause(column, value):
+    """SQL for PostgREST's `is` filter, which only takes null, true or false"""
+    if value not in ("null", "true", "false"):
+        raise ValueError(f"Invalid is filter value: {value!r}")
+    return f"{_ident(column)} IS {value.upper()}"
+
+
+def _parse_group(text, joiner):
+    clauses, params = [], []
+    for part in _split_top_level(text):
+        clause, clause_params = _parse_condition(part)
+        clauses.append(clause)
+        params += clause_params
+    return "(" + f" {joiner} ".join(clauses) + ")", params
+
+
+class SQLiteResponse:
+    """Response object with the same `data` attribute as a Supabase response"""
+
+    def __init__(self, data):
+        self.data = data
+
+
+class _Select:
+    def __init__(self, backend, table, columns):
+        self._backend = backend
+        self._table = table
+        self._columns = "*" if columns.strip() == "*" else ", ".join(
+            _ident(c.strip()) for c in columns.split(","))
+        self._where, self._params, self._order = [], [], []
+        self._limit = None
+
+    def _filter(self, column, op, value):
+        self._where.append(f"{_ident(column)} {_OPERATORS[op]} ?")
+        self._params.append(value)
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def like(self, column, pattern):
+        return self._filter(column, "like", pattern.replace("*", "%"))
+
+    def is_(self, column, value):
+        self._where.append(_is_clause(column, "null" if value is None else str(value).lower()))
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        if not values:
+            self._where.append("0")
+        else:
+            self._where.append(f"{_ident(column)} IN ({', '.join('?' * len(values))})")
+            self._params += values
+        return self
+
+    def or_(self, filters):
+        clause, params = _parse_group(filters, "OR")
+        self._where.append(clause)
+        self._params += params
+        return self
+
+    def order(self, column, desc=False, nullsfirst=None):
+        # PostgreSQL sorts NULLs as larger than any value unless told otherwise
+        if nullsfirst is None:
+            nullsfirst = desc
+        self._order.append(f"{_ident(column)} {'DESC' if desc else 'ASC'} "
+                           f"NULLS {'FIRST' if nullsfirst else 'LAST'}")
+        return self
+
+    def limit(self, size):
+        self._limit = int(size)
+        return self
+
+    def execute(self):
+        sql = f"SELECT {self._columns} FROM {self._table}"
+        if self._where:
+            sql += " WHERE " + " AND ".join(self._where)
+        if self._order:
+            sql += " ORDER BY " + ", ".join(self._order)
+        if self._limit is not None:
+            sql += f" LIMIT {self._limit}"
+        return SQLiteResponse(self._backend.query(sql, self._params))
+
+
+class _Write:
+    def __init__(self, backend, table, rows, conflict_clause):
+        self._backend = backend
+        self._table = table
+        self._rows = [rows] if isinstance(rows, dict) else list(rows)
+        self._conflict_clause = conflict_clause
+
+    def execute(self):
+        statements = []
+        for row in self._rows:
+            columns = [_ident(c) for c in row]
+            conflict = self._conflict_clause(columns) if self._conflict_clause else ""
+            statements.append((
+                f"INSERT INTO {self._table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))}) {conflict} RETURNING *",
+                list(row.values()),
+            ))
+        return SQLiteResponse(self._backend.write(statements))
+
+
+class _Table:
+    def __init__(self, backend, name):
+        self._backend = backend
+        self._name = _ident(name)
+
+    def select(self, columns="*"):
+        return _Select(self._backend, self._name, columns)
+
+    def insert(self, rows, **_):
+        return _Write(self._backend, self._name, rows, None)
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False, **_):
+        key = _ident(on_conflict or "project_id")
+
+        def conflict_clause(columns):
+            if ignore_duplicates:
+                return f"ON CONFLICT ({key}) DO NOTHING"
+            updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != key)
+            return f"ON CONFLICT ({key}) DO UPDATE SET {updates}" if updates else f"ON CONFLICT ({key}) DO NOTHING"
+
+        return _Write(self._backend, self._name, rows, conflict_clause)
+
+
+class _Rpc:
+    def __init__(self, backend, name, params):
+        self._backend = backend
+        self._name = name
+        self._params = params
+
+    def execute(self):
+        if self._name == "reserve_project_ids":
+            return SQLiteResponse(self._backend.reserve_project_ids(**self._params))
+        if self._name == "next_project_id":
+            return SQLiteResponse(self._backend.reserve_project_ids(self._params["p_prefix"], 1))
+        raise ValueError(f"Unknown RPC: {self._name}")
+
+
+class SQLiteClient:
+    """Offline stand-in for the Supabase client backed by SQLite.
+
+    Supports the subset of the query builder the app uses (`select` with
+    `eq`, `like`, `is_`, `in_`, `or_`, `order`, `limit`; `insert`; `upsert`) and the
+    ID allocator RPCs from sql/project_id_allocator.sql, so project_store,
+    project_ids and the apps' queries run unchanged against a local file or
+    an in-memory database. Access is serialised with a lock so it can be
+    shared across threads.
+    """
+
+    def __init__(self, path=":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._conn.executescript(SCHEMA)
+
+    def table(self, name):
+        return _Table(self, name)
+
+    def rpc(self, name, params):
+        return _Rpc(self, name, params)
+
+    def query(self, sql, params=()):
+        with self._lock:
+            try:
+                return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+            except sqlite3.OperationalError as e:
+                # Reported like PostgREST reports a select of an unknown column
+                missing = re.match(r"no such column: (\w+)", str(e))
+                if missing is None:
+                    raise
+                table = re.search(r"FROM (\w+)", sql).group(1)
+                raise APIError({"code": "42703",
+                                "message": f"column {table}.{missing.group(1)} does not exist"}) from e
+
+    def write(self, statements):
+        """Run insert statements in one transaction, like a single PostgREST request"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                rows = [dict(row) for sql, params in statements
+                        for row in self._conn.execute(sql, params).fetchall()]
+            except sqlite3.IntegrityError as e:
+                # Reported like PostgREST reports constraint violations
+                self._conn.execute("ROLLBACK")
+                if "UNIQUE" in str(e):
+                    raise APIError({"code": "23505", "message":
+                                    f"duplicate key value violates unique constraint ({e})"}) from e
+                raise APIError({"code": "23000", "message": str(e)}) from e
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return rows
+
+    def reserve_project_ids(self, p_prefix, p_count):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT last_value FROM project_id_counters WHERE prefix = ?", (p_prefix,)).fetchone()
+                if row is None:
+                    start = len(p_prefix) + len("-req") + 1
+                    seed = self._conn.execute(
+                        "SELECT coalesce(max(cast(substr(project_id, ?) AS integer)), 0) "
+                        "FROM projects WHERE project_id LIKE ? "
+                        "AND substr(project_id, ?) GLOB '[0-9]*' AND NOT substr(project_id, ?) GLOB '*[^0-9]*'",
+                        (start, f"{p_prefix}-req%", start, start)).fetchone()[0]
+                    last = seed + p_count
+                    self._conn.execute("INSERT INTO project_id_counters VALUES (?, ?)", (p_prefix, last))
+                else:
+                    last = row[0] + p_count
+                    self._conn.execute(
+                        "UPDATE project_id_counters SET last_value = ? WHERE prefix = ?", (last, p_prefix))
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return last
+
+
+if __name__ == "__main__":
+    # Quick offline benchmark of ID allocation and lookups under concurrency
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from project_ids import SupabaseIdAllocator
+    from project_store import TTLCache, bulk_insert_projects, fetch_project
+
+    client = SQLiteClient()
+    allocator = SupabaseIdAllocator(client)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        ids = list(executor.map(lambda _: allocator.next_id(), range(10000)))
+    elapsed = time.perf_counter() - start
+    assert len(set(ids)) == len(ids)
+    print(f"Allocated {len(ids)} unique IDs on 16 threads in {elapsed:.3f}s")
+
+    records = [{"project_id": pid, "project_type_category": "ARR", "project_status": "Draft"} for pid in ids]
+    start = time.perf_counter()
+    result = bulk_insert_projects(client, records)
+    print(f"Bulk inserted {len(result.inserted)} projects in {time.perf_counter() - start:.3f}s")
+
+    for label, cache in [("uncached", None), ("cached", TTLCache())]:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(lambda i: fetch_project(client, ids[i % 300], cache=cache), range(20000)))
+        print(f"20000 {label} lookups on 16 threads in {time.perf_counter() - start:.3f}s")
@@ -1,93 +1,51 @@
 import streamlit as st
-from supabase import create_client
-from dotenv import load_dotenv
-import os
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from datetime import datetime
-from datetime import datetime
 
-# Load environment variables from .env
-load_dotenv()
-
-# Initialize Supabase client
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
-supabase = create_client(url, key)
+from async_store import fetch_projects_async, load_lookup_data
+from db import get_async_runner, get_async_supabase, get_project_cache, get_supabase, get_write_queue
+from model_cache import index_analytics, revenue_figures, sensitivity_figures
+from project_ids import SupabaseIdAllocator, get_date_prefix
+from project_store import PROJECT_STATUSES, PROJECT_TYPES, parse_project_id_file, parse_project_ids
+from sensitivity import PARAMETER_LABELS
+from valuation import calculate_npv, carbon_revenue_summary, discounted_payback, irr, mirr
+from write_behind import PENDING, SAVED
 
+# Must be the first Streamlit command, before any cached resource is built
+st.set_page_config(page_title="🌿 Greenbridge Carbon Project Manager", layout="wide")
 
-# Helper function to get today's prefix in YYMMDD format
-def get_date_prefix():
-    return datetime.now().strftime("%y%m%d")
+# Shared Supabase client (one per process, reused across reruns)
+supabase = get_supabase()
+id_allocator = SupabaseIdAllocator(supabase)
+project_cache = get_project_cache()
+async_runner = get_async_runner()
+async_supabase = get_async_supabase()
+write_queue = get_write_queue()
 
 
-# Function to generate next project ID
+# Function to generate next project ID (one atomic round trip to the database counter)
 def get_next_project_id():
     try:
-        today_prefix = datetime.now().strftime("%y%m%d")
-
-        # Step 1: Get all projects with today's prefix
-        response = supabase.table("projects").select("project_id") \
-            .like("project_id", f"{today_prefix}%").execute()
-
-        # Step 2: Count how many already exist
-        count = len(response.data) if response.data else 0
-
-        # Step 3: Add 1 to get the next number
-        next_number = count + 1
-
-        return f"{today_prefix}-req{next_number}"
-
+        return id_allocator.next_id(get_date_prefix())
     except Exception as e:
         st.error(f"Error generating project ID: {str(e)}")
-        return f"{today_prefix}-req1"
+        return None
 
 
-# Function to save project with retry on duplicate key error
+# Function to save project; IDs come from the atomic allocator, so no retry is needed
 def save_project(data):
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            response = supabase.table("projects").insert(data).execute()
-            st.success(f"✅ Project `{data['project_id']}` saved successfully!")
-            return True
-        except Exception as e:
-            error_msg = str(e)
-            if "duplicate key value violates unique constraint" in error_msg:
-                st.warning(f"Attempt {attempt + 1}: Duplicate ID detected. Regenerating...")
-                new_id = get_next_project_id()
-                if new_id:
-                    st.info(f"New ID generated: `{new_id}`")
-                    data["project_id"] = new_id
-                    continue
-                else:
-                    st.error("Failed to regenerate a unique project ID.")
-                    return False
-            else:
-                st.error(f"❌ Failed to save project after {attempt + 1} attempts: {error_msg}")
-                return False
-    return False
-
-
-# Financial model functions
-def calculate_npv(cash_flows, discount_rate):
-    """Calculate Net Present Value of cash flows"""
-    years = np.arange(len(cash_flows))
-    discounted = cash_flows / (1 + discount_rate) ** years
-    return np.sum(discounted)
-
-
-def carbon_revenue_model(area_hectares, carbon_price_per_ton,
-                         sequestration_rate, project_years):
-    """Model carbon revenue based on project parameters"""
-    yearly_sequestration = area_hectares * sequestration_rate
-    revenues = [yearly_sequestration * carbon_price_per_ton for _ in range(project_years)]
-    return np.array(revenues)
+    try:
+        supabase.table("projects").insert(data).execute()
+        project_cache.invalidate(data["project_id"])
+        st.success(f"✅ Project `{data['project_id']}` saved successfully!")
+        return True
+    except Exception as e:
+        st.error(f"❌ Failed to save project: {str(e)}")
+        return False
 
 
 # Streamlit UI
-st.set_page_config(page_title="🌿 Greenbridge Carbon Project Manager", layout="wide")
 st.title("🌿 Greenbridge Capital - Carbon Project Financial Analysis")
 
 # Sidebar navigation
@@ -98,6 +56,10 @@ page = st.sidebar.radio("Go to", ["🔍 Project Lookup", "🆕 New Project", "
 if page == "🔍 Project Lookup":
     st.subheader("Search Existing Projects")
 
+    # Demo financials (projects do not carry their own cash flows yet)
+    demo_cash_flows = np.array([-1000000, 200000, 300000, 400000, 500000])
+    demo_discount_rate = 0.1
+
     col1, col2 = st.columns([3, 1])
     with col1:
         project_id_input = st.text_input("Enter Project ID (e.g., 250406-req1)")
@@ -106,10 +68,11 @@ if page == "🔍 Project Lookup":
 
     if fetch_button and project_id_input:
         try:
-            response = supabase.table("projects").select("*").eq("project_id", project_id_input).execute()
+            # Project row, same-day projects and market history are loaded concurrently
+            project_data, same_day, price_history = async_runner.run(
+                load_lookup_data(async_supabase, project_id_input, cache=project_cache))
 
-            if response.data:
-                project_data = response.data[0]
+            if project_data:
                 st.success(f"✅ Project Found: {project_data['project_id']}")
 
                 # Display basic info
@@ -119,23 +82,76 @@ if page == "🔍 Project Lookup":
                 col2.metric("Status", project_data["project_status"])
                 col3.metric("Submission Date", project_data["project_submission_date"])
 
+                if same_day:
+                    st.markdown("### 🗓️ Projects Submitted the Same Day")
+                    st.dataframe(pd.DataFrame(same_day), use_container_width=True)
+
                 # Financial data section (demo only)
                 st.markdown("### 💰 Financial Summary")
-                cash_flows = np.array([-1000000, 200000, 300000, 400000, 500000])
-                discount_rate = 0.1
+                cash_flows = demo_cash_flows
+                discount_rate = demo_discount_rate
                 npv = calculate_npv(cash_flows, discount_rate)
 
                 fig = px.bar(x=["Year 0", "Year 1", "Year 2", "Year 3", "Year 4"],
                              y=cash_flows, title="Cash Flows")
                 st.plotly_chart(fig)
 
-                st.metric("Net Present Value", f"${npv:,.2f}")
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Net Present Value", f"${npv:,.2f}")
+                col2.metric("IRR", f"{irr(cash_flows):.2%}")
+                col3.metric("MIRR", f"{mirr(cash_flows, discount_rate, discount_rate):.2%}")
+                col4.metric("Discounted Payback", f"{discounted_payback(cash_flows, discount_rate):.1f} years")
+
+                st.markdown("### 📈 NZU Market Context")
+                fig = px.line(price_history, x="Date", y=["ECMI", "ECQI"], title="NZU Market Indices")
+                st.plotly_chart(fig)
+
+                analytics = index_analytics()
+                spread = analytics.spread()
+                spread_mean = analytics.spread(30)
+                col1, col2, col3 = st.columns(3)
+                col1.metric("ECMI 30-day Volatility", f"{analytics.realized_volatility('ECMI', 30)[-1]:.1%}")
+                col2.metric("ECMI Drawdown", f"{analytics.drawdown('ECMI')[-1]:.1%}")
+                col3.metric("ECMI-ECQI Spread", f"${spread[-1]:.2f}",
+                            delta=f"{spread[-1] - spread_mean[-1]:+.2f} vs 30-day mean")
 
             else:
                 st.warning("⚠️ No project found with that ID.")
         except Exception as e:
             st.error(f"❌ Error fetching data: {str(e)}")
 
+    # Batch lookup: resolve many IDs with concurrent queries and value them in one pass
+    with st.expander("📑 Batch Lookup"):
+        ids_text = st.text_area("Paste Project IDs (one per line or comma-separated)")
+        ids_file = st.file_uploader("...or upload a CSV/TXT of Project IDs", type=["csv", "txt"])
+        batch_button = st.button("🔍 Fetch All Projects")
+
+    if batch_button:
+        project_ids = parse_project_ids(ids_text)
+        if ids_file is not None:
+            project_ids = list(dict.fromkeys(project_ids + parse_project_id_file(ids_file.getvalue().decode("utf-8"))))
+
+        if not project_ids:
+            st.warning("⚠️ Enter or upload at least one Project ID.")
+        else:
+            try:
+                rows = async_runner.run(
+                    fetch_projects_async(async_supabase, project_ids, cache=project_cache))
+                found = [rows[pid] for pid in project_ids if pid in rows]
+                missing = [pid for pid in project_ids if pid not in rows]
+
+                if found:
+                    st.success(f"✅ Found {len(found)} of {len(project_ids)} projects")
+                    cash_flows = np.tile(demo_cash_flows, (len(found), 1))
+                    batch_df = pd.DataFrame(found)
+                    batch_df["Net Present Value ($)"] = calculate_npv(cash_flows, demo_discount_rate)
+                    batch_df["IRR"] = irr(cash_flows)
+                    st.dataframe(batch_df, use_container_width=True)
+                if missing:
+                    st.warning(f"⚠️ No project found for: {', '.join(missing)}")
+            except Exception as e:
+                st.error(f"❌ Error fetching data: {str(e)}")
+
 # --- Page 2: Request New Project ---
 elif page == "🆕 New Project":
     st.subheader("Request New Project ID")
@@ -150,8 +166,9 @@ elif page == "🆕 New Project":
         st.markdown(f"**Current New ID:** `{st.session_state.new_project_id}`")
 
         st.markdown("### 📝 Project Details")
-        project_type = st.selectbox("Select Project Type", ["REDD+", "ARR", "PDD", "Other"])
-        project_status = st.selectbox("Initial Status", ["Draft", "Submitted", "Approved"])
+        project_type = st.selectbox("Select Project Type", PROJECT_TYPES)
+        project_status = st.selectbox("Initial Status", PROJECT_STATUSES)
+        background_save = st.checkbox("⚡ Save in background (don't wait for the database)")
 
         if st.button("💾 Save to Database"):
             try:
@@ -162,12 +179,29 @@ elif page == "🆕 New Project":
                     "project_status": project_status
                 }
 
+                if background_save:
+                    write_queue.submit(data)
+                    st.session_state.setdefault("background_saves", []).append(new_id)
+                    del st.session_state.new_project_id
                 # Use the save_project function to save the project
-                if save_project(data):
+                elif save_project(data):
                     del st.session_state.new_project_id
             except Exception as e:
                 st.error(f"❌ Failed to save project: {str(e)}")
 
+    # Final status of saves handed to the background writer
+    if st.session_state.get("background_saves"):
+        st.markdown("### ⏳ Background Saves")
+        for project_id in st.session_state.background_saves:
+            status, message = write_queue.status(project_id) or ("unknown", None)
+            if status == SAVED:
+                st.success(f"✅ Project `{project_id}` saved successfully!")
+            elif status == PENDING:
+                st.info(f"⏳ Project `{project_id}` is being saved...")
+            else:
+                st.error(f"❌ Project `{project_id}` {status}: {message}")
+        st.button("🔄 Refresh Status")
+
 # --- Page 3: Financial Modeling Demo ---
 elif page == "📊 Financial Modeling":
     st.subheader("Carbon Project Financial Model Demo")
@@ -187,32 +221,44 @@ elif page == "📊 Financial Modeling":
         sequestration_rate = st.slider("Annual Sequestration Rate (tons/hectare)", 1.0, 10.0, 5.0, step=0.5)
         project_years = st.slider("Project Duration (years)", 5, 30, 10)
 
-    # Calculate revenues
-    revenues = carbon_revenue_model(area_hectares, carbon_price, sequestration_rate, project_years)
-    cumulative_revenue = np.cumsum(revenues)
+    discount_rate = st.slider("Discount Rate (%)", 0.0, 20.0, 10.0, step=0.5) / 100
 
-    # Create DataFrame for visualization
-    df = pd.DataFrame({
-        "Year": range(1, project_years + 1),
-        "Annual Revenue ($)": revenues,
-        "Cumulative Revenue ($)": cumulative_revenue
-    })
+    point = {
+        "area_hectares": area_hectares,
+        "carbon_price_per_ton": carbon_price,
+        "sequestration_rate": sequestration_rate,
+        "project_years": project_years,
+    }
 
-    # Visualization
-    fig1 = px.line(df, x="Year", y="Cumulative Revenue ($)", title="Cumulative Revenue Over Time")
+    # Visualization (cached per parameter combination across all sessions)
+    fig1, fig2 = revenue_figures(area_hectares, carbon_price, sequestration_rate, project_years)
     st.plotly_chart(fig1)
-
-    fig2 = px.bar(df, x="Year", y="Annual Revenue ($)", title="Annual Revenue Projection")
     st.plotly_chart(fig2)
 
     # Key metrics
-    total_revenue = np.sum(revenues)
-    avg_annual_revenue = total_revenue / project_years
+    npv, total_revenue, avg_annual_revenue = carbon_revenue_summary(
+        area_hectares, carbon_price, sequestration_rate, project_years, discount_rate)
 
     st.markdown("### 📊 Key Financial Metrics")
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     col1.metric("Total Project Revenue", f"${total_revenue:,.2f}")
     col2.metric("Average Annual Revenue", f"${avg_annual_revenue:,.2f}")
+    col3.metric("Net Present Value", f"${npv:,.2f}")
+
+    # Sensitivity analysis
+    st.markdown("### 🎯 Sensitivity Analysis")
+    col1, col2 = st.columns(2)
+    with col1:
+        x_param = st.selectbox("Heatmap X Axis", list(PARAMETER_LABELS), index=1,
+                               format_func=PARAMETER_LABELS.get)
+    with col2:
+        y_params = [name for name in PARAMETER_LABELS if name != x_param]
+        y_param = st.selectbox("Heatmap Y Axis", y_params, format_func=PARAMETER_LABELS.get)
+
+    # The sensitivity grid is built once per discount rate so heatmap slices are lookups
+    heatmap, tornado = sensitivity_figures(discount_rate, x_param, y_param, **point)
+    st.plotly_chart(heatmap)
+    st.plotly_chart(tornado)
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,80 @@
+import asyncio
+
+from async_store import fetch_project_async, fetch_projects_async, fetch_same_day_projects_async, load_lookup_data
+from project_store import MAX_IDS_PER_REQUEST, TTLCache, bulk_insert_projects
+from sqlite_backend import SQLiteClient
+
+
+class _AsyncQuery:
+    def __init__(self, query, client):
+        self._query = query
+        self._client = client
+
+    def __getattr__(self, name):
+        def chain(*args, **kwargs):
+            return _AsyncQuery(getattr(self._query, name)(*args, **kwargs), self._client)
+        return chain
+
+    async def execute(self):
+        self._client.requests += 1
+        return self._query.execute()
+
+
+class _AsyncClient:
+    """Async facade over SQLiteClient that counts requests"""
+
+    def __init__(self, client):
+        self._client = client
+        self.requests = 0
+
+    def table(self, name):
+        return _AsyncQuery(self._client.table(name), self)
+
+
+def _client(n):
+    client = SQLiteClient()
+    bulk_insert_projects(client, [{"project_id": f"250101-req{i}", "project_type_category": "ARR",
+                                   "project_status": "Draft"} for i in range(1, n + 1)])
+    return _AsyncClient(client)
+
+
+def test_fetch_projects_async_batches_and_caches():
+    client = _client(MAX_IDS_PER_REQUEST + 10)
+    ids = [f"250101-req{i}" for i in range(1, MAX_IDS_PER_REQUEST + 12)]
+    cache = TTLCache()
+
+    rows = asyncio.run(fetch_projects_async(client, ids, cache=cache))
+    assert len(rows) == MAX_IDS_PER_REQUEST + 10
+    assert client.requests == 2
+
+    again = asyncio.run(fetch_projects_async(client, ids, cache=cache))
+    assert again == rows
+    assert client.requests == 2
+
+
+def test_fetch_project_async_uses_cache():
+    client = _client(1)
+    cache = TTLCache()
+    row = asyncio.run(fetch_project_async(client, "250101-req1", cache=cache))
+    assert row["project_id"] == "250101-req1"
+    assert asyncio.run(fetch_project_async(client, "250101-req1", cache=cache)) == row
+    assert asyncio.run(fetch_project_async(client, "missing", cache=cache)) is None
+    asyncio.run(fetch_project_async(client, "missing", cache=cache))
+    assert client.requests == 2
+
+
+def test_load_lookup_data_fetches_same_day_projects_concurrently():
+    client = _client(3)
+    bulk_insert_projects(client._client, [{"project_id": "250102-req1", "project_type_category": "ARR",
+                                           "project_status": "Draft"}])
+    row, same_day, prices = asyncio.run(load_lookup_data(client, "250101-req2"))
+    assert row["project_id"] == "250101-req2"
+    assert sorted(r["project_id"] for r in same_day) == ["250101-req1", "250101-req3"]
+    assert len(prices)
+    assert client.requests == 2
+
+
+def test_unparseable_id_has_no_same_day_projects():
+    client = _client(1)
+    assert asyncio.run(fetch_same_day_projects_async(client, "legacy-id")) == []
+    assert client.requests == 0
@@ -0,0 +1,53 @@
+import csv
+
+import pytest
+
+from export_projects import export_csv, export_parquet
+from project_store import KEYSET_COLUMNS, iter_project_pages
+from sqlite_backend import SQLiteClient
+
+COLUMNS = list(KEYSET_COLUMNS) + ["project_status"]
+
+
+@pytest.fixture
+def client():
+    client = SQLiteClient()
+    # The Supabase column allows NULL submission dates; the local default schema does not
+    client.query("DROP TABLE projects")
+    client.query("CREATE TABLE projects (project_id text primary key, project_type_category text, "
+                 "project_status text, project_submission_date text)")
+    rows = [{"project_id": f"250101-req{i}", "project_status": "Draft",
+             "project_submission_date": None if i % 3 == 0 else f"2025-01-{i % 4 + 1:02d}"}
+            for i in range(1, 12)]
+    client.table("projects").insert(rows).execute()
+    return client
+
+
+def _expected(client):
+    rows = client.table("projects").select(",".join(COLUMNS)).execute().data
+    return sorted(rows, key=lambda r: (r["project_submission_date"] is None,
+                                       r["project_submission_date"] or "", r["project_id"]))
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 3, 100])
+def test_pages_cover_every_row_once_with_null_dates_last(client, page_size):
+    rows = [row for page in iter_project_pages(client, COLUMNS, page_size) for row in page]
+    assert rows == _expected(client)
+
+
+def test_csv_export_round_trips(client, tmp_path):
+    path = tmp_path / "projects.csv"
+    count = export_csv(iter_project_pages(client, COLUMNS, 4), path, COLUMNS)
+    with open(path, newline="", encoding="utf-8") as f:
+        exported = list(csv.DictReader(f))
+    expected = [{c: row[c] or "" for c in COLUMNS} for row in _expected(client)]
+    assert count == len(expected) == 11
+    assert exported == expected
+
+
+def test_parquet_export_round_trips(client, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "projects.parquet"
+    count = export_parquet(iter_project_pages(client, COLUMNS, 4), path, COLUMNS)
+    assert count == 11
+    assert pq.read_table(path).to_pylist() == _expected(client)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from index_analytics import SPREAD_COLUMN, IndexAnalytics
+from nzu_data import load_nzu_columns
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return IndexAnalytics.from_index()
+
+
+@pytest.fixture(scope="module")
+def prices():
+    columns = load_nzu_columns()
+    return {name: pd.Series(np.where(values > 0, values, np.nan))
+            for name, values in columns.items() if name != "Date"}
+
+
+@pytest.mark.parametrize("column", ["ECMI", "Daily VWAP"])
+def test_windows_match_pandas(engine, prices, column):
+    price = prices[column]
+    windows = [5, 30, 90]
+    means = engine.rolling_mean(column, windows)
+    drawdowns = engine.drawdown(column, windows)
+    filled = price.ffill()
+    for i, window in enumerate(windows):
+        full = np.arange(len(price)) >= window - 1
+        np.testing.assert_allclose(means[i], price.rolling(window, min_periods=1).mean().where(full))
+        peak = filled.rolling(window, min_periods=1).max().where(full)
+        np.testing.assert_allclose(drawdowns[i], filled / peak - 1)
+    np.testing.assert_allclose(engine.ewma(column, 10),
+                               price.ewm(span=10, adjust=False, ignore_na=True).mean().ffill())
+    np.testing.assert_allclose(engine.drawdown(column), filled / filled.cummax() - 1)
+
+
+def test_spread_statistics(engine, prices):
+    spread = prices["ECMI"] - prices["ECQI"]
+    np.testing.assert_allclose(engine.spread(), spread)
+    np.testing.assert_allclose(engine.spread(30), spread.rolling(30).mean())
+    with pytest.raises(ValueError):
+        engine.realized_volatility(SPREAD_COLUMN, 30)
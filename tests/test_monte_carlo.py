@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from monte_carlo import GBMParams, StreamingStats, calibrate_mean_reverting, stream_revenue_npv
+
+
+def _mean_reverting_path(n, speed, theta, sd, rng):
+    log_prices = np.empty(n)
+    log_prices[0] = theta
+    step_sd = sd * np.sqrt(-np.expm1(-2 * speed) / (2 * speed))
+    for i in range(1, n):
+        log_prices[i] = theta + (log_prices[i - 1] - theta) * np.exp(-speed) + step_sd * rng.normal()
+    return np.exp(log_prices)
+
+
+def test_unit_gaps_match_the_ar1_regression():
+    prices = _mean_reverting_path(5000, 0.02, np.log(50), 0.02, np.random.default_rng(0))
+    expected = calibrate_mean_reverting(prices)
+    actual = calibrate_mean_reverting(prices, elapsed=np.ones(len(prices) - 1))
+    # The likelihood fit uses n rather than n - 2 for the noise variance
+    np.testing.assert_allclose(actual, expected, rtol=1e-3)
+
+
+def test_gaps_are_weighted_by_elapsed_periods():
+    rng = np.random.default_rng(1)
+    prices = _mean_reverting_path(20000, 0.01, np.log(50), 0.02, rng)
+    keep = np.union1d([0], rng.choice(len(prices), len(prices) // 3, replace=False))
+    fit = calibrate_mean_reverting(prices[keep], periods_per_year=1, elapsed=np.diff(keep))
+    assert fit.kappa == pytest.approx(0.01, rel=0.25)
+
+
+def test_streaming_stats_rejects_non_finite_values():
+    with pytest.raises(ValueError):
+        StreamingStats().update([1.0, np.inf])
+
+
+def test_empty_stream_summarises_to_nan():
+    stats = stream_revenue_npv(GBMParams(0.0, 0.1), 50.0, 1000, 5.0, 10, 0.1, n_paths=0)
+    summary = stats.summary()
+    assert summary["count"] == 0
+    assert np.isnan([summary[key] for key in ("mean", "p5", "p50", "p95")]).all()
+    assert np.isnan(stats.quantile(0.5))
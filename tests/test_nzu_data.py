@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import nzu_data
+from nzu_data import (NZU_DATE_FORMAT, NZU_INDEX_CSV, ingest_nzu_file, load_nzu_aggregates,
+                      load_nzu_columns, parse_nzu_dates)
+
+
+@pytest.fixture(scope="module")
+def lines():
+    with open(NZU_INDEX_CSV, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_parse_nzu_dates_matches_pandas():
+    days = np.arange(np.datetime64("1800-01-01"), np.datetime64("2400-01-01"))
+    text = pd.Series(days).dt.strftime(NZU_DATE_FORMAT).to_numpy(dtype=str)
+    np.testing.assert_array_equal(parse_nzu_dates(text), days)
+    np.testing.assert_array_equal(parse_nzu_dates(["1-Jun-2024", "29-feb-2024"]),
+                                  np.array(["2024-06-01", "2024-02-29"], dtype="datetime64[D]"))
+
+
+@pytest.mark.parametrize("text", ["26-May-20245", "31-Feb-2024", "29-Feb-2023", "29-Feb-1900",
+                                  "31-Apr-2024", "0-May-2024", "26-May-202", "26-Mai-2024",
+                                  "26/May/2024", "26-May-0000"])
+def test_parse_nzu_dates_rejects_what_pandas_rejects(text):
+    with pytest.raises(ValueError):
+        pd.to_datetime([text], format=NZU_DATE_FORMAT)
+    with pytest.raises(ValueError):
+        parse_nzu_dates(["26-May-2024", text])
+
+
+def _write(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _assert_same(actual, expected):
+    assert list(actual) == list(expected)
+    for name in expected:
+        # Rolling aggregates come from prefix sums, so allow for rounding
+        np.testing.assert_allclose(actual[name], expected[name], rtol=1e-9, atol=1e-12, err_msg=name)
+
+
+def test_ingest_matches_full_rebuild(tmp_path, lines):
+    full = _write(tmp_path / "full.csv", lines)
+    history = _write(tmp_path / "history.csv", lines[:300])
+    load_nzu_columns(history)
+
+    # The drop overlaps the history and repeats its last row
+    drop = _write(tmp_path / "drop.csv", [lines[0]] + lines[290:] + lines[-1:])
+    assert ingest_nzu_file(drop, history) == len(lines) - 300
+
+    _assert_same(load_nzu_columns(history), load_nzu_columns(full))
+    _assert_same(load_nzu_aggregates(history), load_nzu_aggregates(full))
+
+
+def test_ingested_csv_rebuilds_to_the_same_cache(tmp_path, lines):
+    history = _write(tmp_path / "history.csv", lines[:200])
+    ingest_nzu_file(_write(tmp_path / "drop.csv", [lines[0]] + lines[200:]), history)
+    incremental = {name: np.array(values) for name, values in load_nzu_aggregates(history).items()}
+
+    shutil.rmtree(tmp_path / nzu_data.CACHE_DIR_NAME)
+    _assert_same(load_nzu_aggregates(history), incremental)
+
+
+def test_ingest_skips_known_dates(tmp_path, lines):
+    history = _write(tmp_path / "history.csv", lines)
+    assert ingest_nzu_file(_write(tmp_path / "drop.csv", lines[:50]), history) == 0
+    assert len(load_nzu_columns(history)["Date"]) == len(lines) - 1
+
+
+def _load_repeatedly(path, rounds):
+    for _ in range(rounds):
+        dates = load_nzu_columns(path)["Date"]
+        assert (np.diff(dates) > 0).all()
+
+
+def test_loaders_never_see_ingested_rows_twice(tmp_path, lines):
+    history = _write(tmp_path / "history.csv", lines[:100])
+    load_nzu_columns(history)
+    readers = [multiprocessing.Process(target=_load_repeatedly, args=(history, 200)) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for start in range(100, len(lines), 20):
+        ingest_nzu_file(_write(tmp_path / f"drop{start}.csv", [lines[0]] + lines[start:start + 20]), history)
+    for reader in readers:
+        reader.join()
+        assert reader.exitcode == 0
+
+    full = _write(tmp_path / "full.csv", lines)
+    _assert_same(load_nzu_columns(history), load_nzu_columns(full))
+
+
+def test_missing_column_file_rebuilds_the_cache(tmp_path, lines):
+    history = _write(tmp_path / "history.csv", lines[:200])
+    expected = {name: np.array(values) for name, values in load_nzu_aggregates(history).items()}
+    cache_dir = nzu_data._cache_dir(history)
+    for name in ("ECMI", "ECMI mean 30d"):
+        os.remove(os.path.join(cache_dir, nzu_data._column_file(name)))
+
+    _assert_same(load_nzu_aggregates(history), expected)
+    assert len(load_nzu_columns(history)["ECMI"]) == 199
+
+
+def test_unwritable_cache_falls_back_to_parsing(tmp_path, lines):
+    history = _write(tmp_path / "history.csv", lines[:200])
+    (tmp_path / "cached").mkdir()
+    cached = _write(tmp_path / "cached" / "history.csv", lines[:200])
+    # A file where the cache directory should go makes every cache write fail
+    (tmp_path / nzu_data.CACHE_DIR_NAME).write_text("", encoding="utf-8")
+
+    _assert_same(load_nzu_columns(history), load_nzu_columns(cached))
+    _assert_same(load_nzu_aggregates(history), load_nzu_aggregates(cached))
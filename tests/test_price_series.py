@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_series import PriceSeries
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    values = 50 + np.cumsum(rng.normal(size=400))
+    values[rng.random(400) < 0.4] = 0.0
+    return PriceSeries(np.arange(400), values)
+
+
+def _masked(series):
+    return pd.Series(np.where(series.valid, series.values, np.nan))
+
+
+@pytest.mark.parametrize("window", [2, 7, 30])
+def test_rolling_statistics_skip_no_trade_days(series, window):
+    prices = _masked(series)
+    full = np.arange(len(series)) >= window - 1
+    np.testing.assert_allclose(series.rolling_mean(window),
+                               prices.rolling(window, min_periods=1).mean().where(full))
+    np.testing.assert_allclose(series.rolling_std(window),
+                               prices.rolling(window, min_periods=2).std().where(full))
+    returns = pd.Series(series.log_returns())
+    np.testing.assert_allclose(series.rolling_volatility(window),
+                               returns.rolling(window, min_periods=2).std().where(full))
+
+
+def test_several_windows_share_one_call(series):
+    block = series.rolling_mean([7, 30])
+    assert block.shape == (2, len(series))
+    np.testing.assert_array_equal(block[1], series.rolling_mean(30))
+
+
+def test_gaps_are_masked_in_returns_and_fills():
+    series = PriceSeries(np.array([0, 1, 2, 3]), np.array([10.0, 0.0, 11.0, 12.0]))
+    assert np.isnan(series.log_returns()[:3]).all()
+    np.testing.assert_array_equal(series.forward_filled(), [10.0, 10.0, 11.0, 12.0])
+    np.testing.assert_array_equal(series.elapsed_days(), [2, 1])
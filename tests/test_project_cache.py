@@ -0,0 +1,58 @@
+import project_store
+from project_store import TTLCache, bulk_insert_projects, fetch_project
+from sqlite_backend import SQLiteClient
+
+
+class _CountingClient(SQLiteClient):
+    requests = 0
+
+    def query(self, sql, params=()):
+        self.requests += 1
+        return super().query(sql, params)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(project_store.time, "monotonic", lambda: now[0])
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_lookups_and_misses_are_served_from_cache():
+    client = _CountingClient()
+    bulk_insert_projects(client, [{"project_id": "250101-req1", "project_type_category": "ARR",
+                                   "project_status": "Draft"}])
+    cache = TTLCache()
+    for _ in range(3):
+        assert fetch_project(client, "250101-req1", cache=cache)["project_status"] == "Draft"
+        assert fetch_project(client, "missing", cache=cache) is None
+    assert client.requests == 2
+
+    # A subset of the cached columns is a hit; a wider request is not
+    assert fetch_project(client, "250101-req1", columns=("project_id",), cache=cache) == {
+        "project_id": "250101-req1"}
+    assert client.requests == 2
+
+
+def test_inserts_invalidate_cached_misses():
+    client = SQLiteClient()
+    cache = TTLCache()
+    assert fetch_project(client, "250101-req1", cache=cache) is None
+    bulk_insert_projects(client, [{"project_id": "250101-req1", "project_type_category": "ARR",
+                                   "project_status": "Draft"}], cache=cache)
+    assert fetch_project(client, "250101-req1", cache=cache) is not None
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from project_ids import LocalIdAllocator, SupabaseIdAllocator, parse_project_id
+from sqlite_backend import SQLiteClient
+
+
+@pytest.fixture(params=["supabase", "local"])
+def allocator(request):
+    if request.param == "supabase":
+        return SupabaseIdAllocator(SQLiteClient())
+    return LocalIdAllocator()
+
+
+def test_parse_project_id():
+    assert parse_project_id("250101-req12") == ("250101", 12)
+    assert parse_project_id("250101-reqabc") is None
+    assert parse_project_id("250101") is None
+
+
+def test_concurrent_ids_are_unique_and_consecutive(allocator):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = list(executor.map(lambda _: allocator.next_id("250101"), range(200)))
+    assert sorted(parse_project_id(i)[1] for i in ids) == list(range(1, 201))
+
+
+def test_prefixes_have_independent_counters(allocator):
+    assert allocator.next_id("250101") == "250101-req1"
+    assert allocator.next_id("250102") == "250102-req1"
+    assert allocator.next_id("250101") == "250101-req2"
+
+
+def test_counter_is_seeded_from_existing_ids():
+    client = SQLiteClient()
+    client.table("projects").insert([{"project_id": "250101-req7"}, {"project_id": "250101-reqabc"},
+                                     {"project_id": "250102-req40"}]).execute()
+    assert SupabaseIdAllocator(client).next_id("250101") == "250101-req8"
+    local = LocalIdAllocator(["250101-req7", "250101-reqabc", "250102-req40"])
+    assert local.next_id("250101") == "250101-req8"
+
+
+def test_concurrent_blocks_do_not_overlap(allocator):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        blocks = list(executor.map(lambda n: allocator.reserve_block(n % 5 + 1, "250101"), range(50)))
+    ids = [project_id for block in blocks for project_id in block]
+    assert len(ids) == len(set(ids)) == sum(n % 5 + 1 for n in range(50))
+
+
+def test_block_hands_out_its_range_then_stops(allocator):
+    block = allocator.reserve_block(3, "250101")
+    assert len(block) == block.remaining == 3
+    assert [block.next_id() for _ in range(3)] == ["250101-req1", "250101-req2", "250101-req3"]
+    assert block.remaining == 0
+    with pytest.raises(ValueError):
+        block.next_id()
+    assert allocator.next_id("250101") == "250101-req4"
+
+
+def test_block_size_must_be_positive(allocator):
+    with pytest.raises(ValueError):
+        allocator.reserve_block(0, "250101")
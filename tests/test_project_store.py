@@ -0,0 +1,53 @@
+import httpx
+import pytest
+
+from project_store import bulk_insert_projects, parse_project_id_file, parse_project_ids
+from sqlite_backend import SQLiteClient
+
+
+def _record(project_id, **fields):
+    return {"project_id": project_id, "project_type_category": "ARR",
+            "project_status": "Draft", **fields}
+
+
+def test_rejected_rows_are_isolated():
+    client = SQLiteClient()
+    records = [_record("250101-req1"), _record("250101-req2", project_submission_date=None),
+               _record("250101-req3")]
+    result = bulk_insert_projects(client, records)
+    assert result.inserted == ["250101-req1", "250101-req3"]
+    assert [project_id for project_id, _ in result.errors] == ["250101-req2"]
+
+
+def test_existing_ids_are_conflicts():
+    client = SQLiteClient()
+    bulk_insert_projects(client, [_record("250101-req1")])
+    result = bulk_insert_projects(client, [_record("250101-req1"), _record("250101-req2")])
+    assert result.inserted == ["250101-req2"]
+    assert result.conflicts == ["250101-req1"]
+
+
+class _UnreachableClient(SQLiteClient):
+    def write(self, statements):
+        self.calls = getattr(self, "calls", 0) + 1
+        raise httpx.ConnectTimeout("timed out")
+
+
+def test_transport_errors_are_raised_without_row_retries():
+    client = _UnreachableClient()
+    with pytest.raises(httpx.ConnectTimeout):
+        bulk_insert_projects(client, [_record(f"250101-req{i}") for i in range(1, 6)])
+    assert client.calls == 1
+
+
+def test_uploaded_csv_uses_first_column_without_header():
+    text = 'project_id,project_status\n250101-req1,Draft\n"250101-req2",Active\n250101-req1,Draft\n,\n'
+    assert parse_project_id_file(text) == ["250101-req1", "250101-req2"]
+
+
+def test_uploaded_txt_without_header_keeps_first_row():
+    assert parse_project_id_file("250101-req1\n250101-req2\n") == ["250101-req1", "250101-req2"]
+
+
+def test_pasted_ids_split_on_separators():
+    assert parse_project_ids("250101-req1, 250101-req2\n250101-req1") == ["250101-req1", "250101-req2"]
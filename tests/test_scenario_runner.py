@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from scenario_runner import DEFAULT_VALUATION_INPUTS, fetch_portfolio, run_portfolio
+from sqlite_backend import SQLiteClient
+
+
+def _client(*extra_columns):
+    client = SQLiteClient()
+    for column in extra_columns:
+        client.query(f"ALTER TABLE projects ADD COLUMN {column}")
+    return client
+
+
+def test_missing_input_columns_are_dropped():
+    client = _client()
+    client.table("projects").insert([{"project_id": "250101-req1"}]).execute()
+    assert fetch_portfolio(client) == [{"project_id": "250101-req1"}]
+
+
+def test_project_inputs_drive_the_valuation():
+    client = _client("area_hectares real", "project_years integer")
+    client.table("projects").insert([
+        {"project_id": "250101-req1", "area_hectares": 100, "project_years": 5},
+        {"project_id": "250101-req2"},
+    ]).execute()
+    projects = fetch_portfolio(client)
+    assert projects[0]["area_hectares"] == 100
+
+    paths = np.full((10, 20), 50.0)
+    result = run_portfolio(projects, paths, max_workers=1).set_index("project_id")
+    small = 100 * DEFAULT_VALUATION_INPUTS["sequestration_rate"] * 50
+    assert result.loc["250101-req1", "npv_mean"] == pytest.approx(
+        small * sum(1.1 ** -t for t in range(1, 6)))
+    assert result.loc["250101-req2", "npv_mean"] > result.loc["250101-req1", "npv_mean"]
+
+
+def test_projects_longer_than_the_paths_are_rejected():
+    with pytest.raises(ValueError):
+        run_portfolio([{"project_id": "x", "project_years": 30}], np.ones((5, 10)), max_workers=1)
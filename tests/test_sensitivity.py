@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from sensitivity import DEFAULT_AXES, SensitivityGrid
+from valuation import carbon_revenue_summary
+
+
+@pytest.fixture(scope="module")
+def grid():
+    return SensitivityGrid(0.1)
+
+
+def test_tornado_swings_are_exact_at_axis_limits(grid):
+    point = {"area_hectares": 10000, "carbon_price_per_ton": 50,
+             "sequestration_rate": 5.0, "project_years": 10}
+    df = grid.tornado(**point).set_index("parameter")
+    base, _, _ = carbon_revenue_summary(10000, 50, 5.0, 10, 0.1)
+    assert df.loc["Carbon Price ($/ton)", "high"] == pytest.approx(0.2 * base)
+    assert df.loc["Project Area (hectares)", "low"] == pytest.approx(-0.2 * base)
+
+
+def test_tornado_duration_swing_is_not_snapped(grid):
+    point = {"area_hectares": 1000, "carbon_price_per_ton": 20,
+             "sequestration_rate": 5.0, "project_years": 7}
+    df = grid.tornado("total_revenue", **point).set_index("parameter")
+    _, total, _ = carbon_revenue_summary(1000, 20, 5.0, 7)
+    assert df.loc["Project Duration (years)", "high"] == pytest.approx(0.2 * total)
+
+
+def test_axes_order_does_not_change_the_values(grid):
+    reordered = SensitivityGrid(0.1, dict(reversed(list(DEFAULT_AXES.items()))))
+    point = {"area_hectares": 1000, "carbon_price_per_ton": 20,
+             "sequestration_rate": 5.0, "project_years": 10}
+    np.testing.assert_allclose(reordered.slice("carbon_price_per_ton", "area_hectares", **point),
+                               grid.slice("carbon_price_per_ton", "area_hectares", **point))
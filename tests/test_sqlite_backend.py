@@ -0,0 +1,89 @@
+import pytest
+from postgrest.exceptions import APIError
+
+from sqlite_backend import SQLiteClient
+
+
+@pytest.fixture
+def client():
+    client = SQLiteClient()
+    client.table("projects").insert([
+        {"project_id": f"250101-req{i}", "project_type_category": "ARR" if i % 2 else "PDD",
+         "project_status": "Draft", "project_submission_date": f"2025-01-0{i}"}
+        for i in range(1, 6)
+    ]).execute()
+    return client
+
+
+def _ids(response):
+    return [row["project_id"] for row in response.data]
+
+
+def test_filters_order_and_limit(client):
+    projects = client.table("projects")
+    assert _ids(projects.select("project_id").eq("project_type_category", "PDD")
+                .order("project_id").execute()) == ["250101-req2", "250101-req4"]
+    assert _ids(projects.select("project_id").like("project_id", "*req3").execute()) == ["250101-req3"]
+    assert _ids(projects.select("project_id").in_("project_id", []).execute()) == []
+    assert _ids(projects.select("project_id").gt("project_submission_date", "2025-01-02")
+                .lt("project_submission_date", "2025-01-05")
+                .order("project_id", desc=True).limit(1).execute()) == ["250101-req4"]
+
+
+def test_or_filter_with_nested_and_and_quoted_commas(client):
+    response = client.table("projects").select("project_id").or_(
+        'project_status.eq."Draft,Old",'
+        'and(project_submission_date.eq."2025-01-02",project_id.gt."250101-req1"),'
+        'project_id.eq.250101-req5').order("project_id").execute()
+    assert _ids(response) == ["250101-req2", "250101-req5"]
+
+
+def test_upsert_ignoring_duplicates_keeps_existing_rows(client):
+    response = client.table("projects").upsert(
+        [{"project_id": "250101-req1", "project_status": "Approved"},
+         {"project_id": "250101-req9", "project_status": "Approved"}],
+        on_conflict="project_id", ignore_duplicates=True).execute()
+    assert _ids(response) == ["250101-req9"]
+    row = client.table("projects").select("project_status").eq("project_id", "250101-req1").execute()
+    assert row.data == [{"project_status": "Draft"}]
+
+
+def test_upsert_updates_existing_rows(client):
+    client.table("projects").upsert({"project_id": "250101-req1", "project_status": "Approved"}).execute()
+    row = client.table("projects").select("project_status").eq("project_id", "250101-req1").execute()
+    assert row.data == [{"project_status": "Approved"}]
+
+
+def test_rpc_reserves_after_existing_ids(client):
+    assert client.rpc("reserve_project_ids", {"p_prefix": "250101", "p_count": 3}).execute().data == 8
+    assert client.rpc("next_project_id", {"p_prefix": "250101"}).execute().data == 9
+    with pytest.raises(ValueError):
+        client.rpc("unknown", {}).execute()
+
+
+def test_errors_are_reported_like_postgrest(client):
+    with pytest.raises(APIError) as duplicate:
+        client.table("projects").insert({"project_id": "250101-req1"}).execute()
+    assert duplicate.value.code == "23505"
+
+    with pytest.raises(APIError) as not_null:
+        client.table("projects").insert({"project_id": "250101-req9", "project_submission_date": None}).execute()
+    assert not_null.value.code == "23000"
+
+    with pytest.raises(APIError) as unknown:
+        client.table("projects").select("project_id,budget").execute()
+    assert unknown.value.code == "42703"
+    assert unknown.value.message == "column projects.budget does not exist"
+
+
+def test_failed_write_rolls_back_the_whole_request(client):
+    with pytest.raises(APIError):
+        client.table("projects").insert([{"project_id": "250101-req8"}, {"project_id": "250101-req1"}]).execute()
+    assert client.table("projects").select("project_id").eq("project_id", "250101-req8").execute().data == []
+
+
+def test_identifiers_are_validated(client):
+    with pytest.raises(ValueError):
+        client.table("projects; drop table projects").select("*")
+    with pytest.raises(ValueError):
+        client.table("projects").select("project_id").eq("project_id = 1 or 1", 1)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from valuation import calculate_npv, discounted_payback, irr, mirr
+
+
+def test_irr_simple_root():
+    assert irr([-100, 110]) == pytest.approx(0.10)
+
+
+def test_irr_matches_npv_root():
+    flows = [-1000, 300, 400, 500, 200]
+    assert calculate_npv(flows, irr(flows)) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_irr_all_zero_row_is_nan():
+    assert np.isnan(irr([0, 0, 0]))
+
+
+def test_irr_without_sign_change_is_nan():
+    assert np.isnan(irr([100, 100, 100]))
+    assert np.isnan(irr([-100, -100]))
+
+
+def test_irr_widens_bracket_for_large_rates():
+    assert irr([-1, 100]) == pytest.approx(99.0)
+
+
+def test_irr_root_on_bracket_end():
+    # NPV is exactly zero at the initial upper bound of 100%
+    assert irr([-1, 2]) == pytest.approx(1.0)
+
+
+def test_irr_falls_back_to_bisection():
+    # The NPV profile is nearly flat at the bracket midpoint, so the first
+    # Newton step lands far outside the bracket and bisection takes over
+    flows = [-1000, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1]
+    assert irr(flows) == pytest.approx(1000 ** -0.1 - 1)
+
+
+def test_irr_rows_are_independent():
+    flows = np.array([[-100, 110], [0, 0], [100, 100]])
+    rates = irr(flows)
+    assert rates[0] == pytest.approx(0.10)
+    assert np.isnan(rates[1]) and np.isnan(rates[2])
+
+
+def test_irr_keeps_an_exact_root_hit_by_iteration():
+    # The first bisection midpoint of (-0.99, 1] is exactly the root
+    assert irr([-1, 1.005]) == pytest.approx(0.005)
+
+
+def test_mirr_known_value():
+    flows = [-120000, 39000, 30000, 21000, 37000, 46000]
+    assert mirr(flows, 0.10, 0.12) == pytest.approx(0.126094, abs=1e-6)
+
+
+def test_mirr_without_outflows_or_inflows_is_nan():
+    assert np.isnan(mirr([-100, -50, -25], 0.1, 0.1))
+    assert np.isnan(mirr([100, 50, 25], 0.1, 0.1))
+
+
+def test_mirr_single_period_is_nan():
+    assert np.isnan(mirr([-100], 0.1, 0.1))
+    assert np.isnan(mirr([[-100], [50]], 0.1, 0.1)).all()
+
+
+def test_discounted_payback_known_values():
+    assert discounted_payback([-100, 60, 60], 0.0) == pytest.approx(1 + 40 / 60)
+    # Discounted at 10%: -100, 54.55, 49.59 -> pays back during year 2
+    expected = 1 + (100 - 60 / 1.1) / (60 / 1.21)
+    assert discounted_payback([-100, 60, 60, 60], 0.1) == pytest.approx(expected)
+    assert discounted_payback([100, -50], 0.1) == 0
+
+
+def test_discounted_payback_never_reached_is_nan():
+    assert np.isnan(discounted_payback([-100, 30, 30, 30], 0.1))
+    assert np.isnan(discounted_payback([-100, -10, -10], 0.1))
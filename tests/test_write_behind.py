@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import sys
+
+import httpx
+
+from sqlite_backend import SQLiteClient
+from write_behind import CONFLICT, FAILED, SAVED, WriteBehindQueue
+
+
+def _record(project_id, **fields):
+    return {"project_id": project_id, "project_type_category": "ARR",
+            "project_status": "Draft", **fields}
+
+
+def _stored_ids(client):
+    return {row["project_id"] for row in client.table("projects").select("project_id").execute().data}
+
+
+def _journal(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class _UnreachableClient(SQLiteClient):
+    def write(self, statements):
+        raise httpx.ConnectTimeout("timed out")
+
+
+def test_saves_conflicts_and_compacts(tmp_path):
+    journal = str(tmp_path / "journal.jsonl")
+    client = SQLiteClient()
+    client.table("projects").insert(_record("250101-req1")).execute()
+    saves = WriteBehindQueue(client, journal, retry_delay=0)
+    saves.submit(_record("250101-req1"))
+    saves.submit(_record("250101-req2"))
+    saves.join()
+
+    assert saves.status("250101-req1")[0] == CONFLICT
+    assert saves.status("250101-req2") == (SAVED, None)
+    assert _journal(journal) == []
+
+
+def test_unsent_saves_are_replayed_after_restart(tmp_path):
+    journal = str(tmp_path / "journal.jsonl")
+    saves = WriteBehindQueue(_UnreachableClient(), journal, max_retries=2, retry_delay=0)
+    saves.submit(_record("250101-req1"))
+    saves.join()
+    assert saves.status("250101-req1") == (FAILED, "timed out")
+
+    client = SQLiteClient()
+    restarted = WriteBehindQueue(client, journal, retry_delay=0)
+    restarted.join()
+    assert restarted.status("250101-req1") == (SAVED, None)
+    assert _stored_ids(client) == {"250101-req1"}
+
+
+def test_rejected_rows_are_final(tmp_path):
+    journal = str(tmp_path / "journal.jsonl")
+    client = SQLiteClient()
+    saves = WriteBehindQueue(client, journal, retry_delay=0)
+    saves.submit(_record("250101-req1", project_submission_date=None))
+    saves.join()
+    assert saves.status("250101-req1")[0] == FAILED
+
+    restarted = WriteBehindQueue(client, journal, retry_delay=0)
+    restarted.join()
+    assert restarted.status("250101-req1") is None
+    assert _journal(journal) == []
+
+
+def test_compaction_keeps_other_processes_pending_saves(tmp_path):
+    journal = str(tmp_path / "journal.jsonl")
+    running = {"op": "submit", "pid": os.getppid(), "record": _record("250101-req1")}
+    crashed = {"op": "submit", "pid": _dead_pid(), "record": _record("250101-req2")}
+    with open(journal, "w", encoding="utf-8") as f:
+        f.write(json.dumps(running) + "\n" + json.dumps(crashed) + "\n")
+
+    client = SQLiteClient()
+    saves = WriteBehindQueue(client, journal, retry_delay=0)
+    saves.submit(_record("250101-req3"))
+    saves.join()
+
+    # Only the crashed process's save is adopted; the running one's stays journaled for it
+    assert _stored_ids(client) == {"250101-req2", "250101-req3"}
+    assert saves.status("250101-req1") is None
+    assert _journal(journal) == [running]
+
+
+def test_worker_survives_unexpected_errors(tmp_path, monkeypatch):
+    journal = str(tmp_path / "journal.jsonl")
+    client = SQLiteClient()
+    saves = WriteBehindQueue(client, journal, retry_delay=0)
+    finish = saves._finish
+
+    def broken_finish(project_id, status, message=None):
+        if project_id == "250101-req1":
+            raise RuntimeError("journal unavailable")
+        finish(project_id, status, message)
+
+    monkeypatch.setattr(saves, "_finish", broken_finish)
+    saves.submit(_record("250101-req1"))
+    saves.join()
+    assert saves.status("250101-req1") == (FAILED, "Save failed unexpectedly: journal unavailable")
+
+    saves.submit(_record("250101-req2"))
+    saves.join()
+    assert saves.status("250101-req2") == (SAVED, None)
+    assert [entry["record"]["project_id"] for entry in _journal(journal)] == ["250101-req1"]
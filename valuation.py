@@ -0,0 +1,185 @@
+import numpy as np
+
+
+def discount_factors(discount_rate, n_years, start_year=1):
+    """Discount factors 1 / (1 + r) ** t for t = start_year .. start_year + n_years - 1.
+
+    `discount_rate` is a fraction (0.05 for 5%) and may be a scalar or an array;
+    the result has shape `np.shape(discount_rate) + (n_years,)`.
+    """
+    rates = np.asarray(discount_rate, dtype=float)
+    years = np.arange(start_year, start_year + n_years)
+    return (1.0 + rates[..., None]) ** -years
+
+
+def calculate_npv(cash_flows, discount_rate):
+    """Calculate Net Present Value of cash flows
+
+    `cash_flows` is a 1-D vector or an (n_scenarios x n_years) matrix with the
+    year-0 flow in the first column. `discount_rate` is a scalar or an array
+    that broadcasts against the leading (scenario) axes, so a column vector of
+    rates against a scenario matrix values every rate/scenario combination.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    factors = discount_factors(discount_rate, cash_flows.shape[-1], start_year=0)
+    return np.sum(cash_flows * factors, axis=-1)
+
+
+def annuity_factor(discount_rate, project_years):
+    """Present value of 1 received at the end of each of years 1..project_years.
+
+    Closed form (1 - (1 + r) ** -n) / r, falling back to n when r is zero.
+    Both arguments may be arrays and broadcast against each other.
+    """
+    rates = np.asarray(discount_rate, dtype=float)
+    years = np.asarray(project_years, dtype=float)
+    safe_rates = np.where(rates == 0, 1.0, rates)
+    return np.where(rates == 0, years, (1.0 - (1.0 + safe_rates) ** -years) / safe_rates)
+
+
+def carbon_revenue_model(area_hectares, carbon_price_per_ton,
+                         sequestration_rate, project_years):
+    """Model carbon revenue based on project parameters"""
+    yearly_sequestration = area_hectares * sequestration_rate
+    return np.full(project_years, yearly_sequestration * carbon_price_per_ton, dtype=float)
+
+
+def carbon_revenue_summary(area_hectares, carbon_price_per_ton,
+                           sequestration_rate, project_years, discount_rate=0.0):
+    """NPV, total and average annual revenue of the constant-flow model in O(1).
+
+    Gives the same figures as summarising `carbon_revenue_model` without
+    building the per-year array; revenue is discounted from year 1.
+    """
+    annual_revenue = area_hectares * sequestration_rate * carbon_price_per_ton
+    npv = annual_revenue * annuity_factor(discount_rate, project_years)
+    total_revenue = annual_revenue * project_years
+    return float(npv), float(total_revenue), float(annual_revenue)
+
+
+def batch_revenue_npv(carbon_prices, sequestration, project_years, discount_rates):
+    """Value many constant-revenue carbon scenarios in one call.
+
+    Annual revenue is `carbon_prices * sequestration`, received at the end of
+    years 1..project_years and discounted at `discount_rates` (fractions).
+    All four inputs broadcast against each other and are valued with the
+    closed-form annuity factor, so the cost is O(1) per scenario.
+
+    Returns a tuple `(npv, total_revenue)` of arrays with the broadcast shape.
+    """
+    annual = np.multiply(carbon_prices, sequestration, dtype=float)
+    npv = annual * annuity_factor(discount_rates, project_years)
+    total_revenue = annual * np.asarray(project_years, dtype=float)
+    return np.broadcast_arrays(npv, total_revenue)
+
+
+def _npv_and_derivative(cash_flows, rates):
+    """Row-wise NPV and d(NPV)/d(rate) for an (n x T) cash-flow matrix"""
+    years = np.arange(cash_flows.shape[1])
+    factors = discount_factors(rates, cash_flows.shape[1], start_year=0)
+    discounted = cash_flows * factors
+    npv = discounted.sum(axis=1)
+    derivative = -(discounted * years).sum(axis=1) / (1.0 + rates)
+    return npv, derivative
+
+
+def irr(cash_flows, tol=1e-10, max_iter=100):
+    """Internal rate of return for one cash-flow vector or each row of a matrix.
+
+    Uses a vectorized safeguarded Newton iteration: every row keeps a bracket
+    [lo, hi] around its root and falls back to bisection whenever a Newton
+    step would leave the bracket. Rows that are all zero, or whose NPV never
+    changes sign for rates in (-0.99, 2**20], get NaN.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    flows = cash_flows.reshape(-1, cash_flows.shape[-1])
+    n = flows.shape[0]
+
+    lo = np.full(n, -0.99)
+    hi = np.full(n, 1.0)
+    f_lo, _ = _npv_and_derivative(flows, lo)
+    f_hi, _ = _npv_and_derivative(flows, hi)
+    nonzero = flows.any(axis=1)
+
+    # Widen the upper end of the bracket until the NPV changes sign
+    for _ in range(20):
+        widen = nonzero & (np.sign(f_lo) == np.sign(f_hi))
+        if not widen.any():
+            break
+        hi[widen] *= 2
+        f_hi[widen], _ = _npv_and_derivative(flows[widen], hi[widen])
+
+    valid = nonzero & ((np.sign(f_lo) != np.sign(f_hi)) | (f_lo == 0) | (f_hi == 0))
+    rate = np.where(f_hi == 0, hi, np.where(f_lo == 0, lo, 0.5 * (lo + hi)))
+    active = valid & (f_lo != 0) & (f_hi != 0)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        f, df = _npv_and_derivative(flows[idx], rate[idx])
+
+        # Shrink the bracket around the root
+        same_as_lo = np.sign(f) == np.sign(f_lo[idx])
+        lo[idx] = np.where(same_as_lo, rate[idx], lo[idx])
+        f_lo[idx] = np.where(same_as_lo, f, f_lo[idx])
+        hi[idx] = np.where(same_as_lo, hi[idx], rate[idx])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = rate[idx] - f / df
+        inside = np.isfinite(newton) & (newton > lo[idx]) & (newton < hi[idx])
+        new_rate = np.where(inside, newton, 0.5 * (lo[idx] + hi[idx]))
+
+        # An exact root keeps its rate rather than moving to the next midpoint
+        new_rate = np.where(f == 0, rate[idx], new_rate)
+        converged = (np.abs(new_rate - rate[idx]) < tol) | (f == 0)
+        rate[idx] = new_rate
+        active[idx[converged]] = False
+
+    rate[~valid] = np.nan
+    return rate.reshape(cash_flows.shape[:-1])[()]
+
+
+def mirr(cash_flows, finance_rate, reinvest_rate):
+    """Modified internal rate of return for one cash-flow vector or each row of a matrix.
+
+    Outflows are discounted to year 0 at `finance_rate` and inflows are
+    compounded to the final year at `reinvest_rate`. Rows without both an
+    outflow and an inflow, and inputs with fewer than two periods, get NaN.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    n_years = cash_flows.shape[-1]
+    finance = np.asarray(finance_rate, dtype=float)[..., None]
+    reinvest = np.asarray(reinvest_rate, dtype=float)[..., None]
+    if n_years < 2:
+        shape = np.broadcast_shapes(cash_flows.shape[:-1], finance.shape[:-1], reinvest.shape[:-1])
+        return np.full(shape, np.nan)[()]
+    years = np.arange(n_years)
+
+    pv_outflows = np.sum(np.minimum(cash_flows, 0) / (1 + finance) ** years, axis=-1)
+    fv_inflows = np.sum(np.maximum(cash_flows, 0) * (1 + reinvest) ** (n_years - 1 - years), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = (fv_inflows / -pv_outflows) ** (1.0 / (n_years - 1)) - 1
+    return np.where((pv_outflows < 0) & (fv_inflows > 0), result, np.nan)[()]
+
+
+def discounted_payback(cash_flows, discount_rate):
+    """Years until cumulative discounted cash flow turns non-negative.
+
+    Interpolates linearly within the year the balance crosses zero, with the
+    year-0 flow at t=0. Rows that never pay back get NaN.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    discounted = cash_flows * discount_factors(discount_rate, cash_flows.shape[-1], start_year=0)
+    cumulative = np.cumsum(discounted, axis=-1)
+
+    paid_back = cumulative >= 0
+    year = np.argmax(paid_back, axis=-1)
+    ever = paid_back.any(axis=-1)
+
+    before = np.take_along_axis(cumulative, np.maximum(year - 1, 0)[..., None], axis=-1)[..., 0]
+    step = np.take_along_axis(discounted, year[..., None], axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(year > 0, -before / step, 0.0)
+    payback = np.maximum(year - 1, 0) + fraction
+    return np.where(ever, payback, np.nan)[()]
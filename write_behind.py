@@ -0,0 +1,220 @@
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: journal writers are not serialised across processes
+    fcntl = None
+
+from project_store import bulk_insert_projects, validate_project_record
+
+
+# Journal of accepted saves, replayed on start so queued saves survive restarts
+DEFAULT_JOURNAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".project_journal.jsonl")
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_DELAY = 1.0
+
+# Status values reported by WriteBehindQueue.status
+PENDING = "pending"
+SAVED = "saved"
+CONFLICT = "conflict"
+FAILED = "failed"
+
+
+class WriteBehindQueue:
+    """Acknowledge project saves immediately and persist them on a background worker.
+
+    Every accepted record is appended to a local JSONL journal (and fsynced)
+    before `submit` returns; a record leaves the journal only once the
+    database has answered for it. On start the journal is replayed, so saves
+    queued before a crash or restart are retried. Replayed records that turn
+    out to exist already are reported as saved, since the earlier attempt
+    may have written them before it could be journaled as done.
+
+    Several processes may share one journal: every write holds an exclusive
+    lock on `<journal>.lock`, compaction keeps every process's outstanding
+    records, and a start only replays records whose submitting process is
+    no longer running.
+
+    The worker drains up to `batch_size` records at a time through
+    `bulk_insert_projects`. Rows the database rejects are final and reported
+    as failed. Requests that fail in transit are retried with exponential
+    backoff; rows still failing after `max_retries`, or caught by an
+    unexpected error, are reported as failed but stay in the journal for
+    the next start.
+    """
+
+    def __init__(self, client, journal_path=DEFAULT_JOURNAL, batch_size=DEFAULT_BATCH_SIZE,
+                 max_retries=DEFAULT_MAX_RETRIES, retry_delay=DEFAULT_RETRY_DELAY, cache=None):
+        self.client = client
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.cache = cache
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._statuses = {}
+        self._outstanding = {}
+        self._replayed = set()
+
+        self._replay_journal()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, record):
+        """Journal a project record and queue it; returns its project ID straight away"""
+        error = validate_project_record(record)
+        if error:
+            raise ValueError(error)
+        record = dict(record)
+        with self._lock:
+            self._append_journal({"op": "submit", "pid": os.getpid(), "record": record}, sync=True)
+            self._outstanding[record["project_id"]] = record
+            self._statuses[record["project_id"]] = (PENDING, None)
+        self._queue.put(record)
+        return record["project_id"]
+
+    def status(self, project_id):
+        """`(status, message)` for a submitted project ID, or None if unknown"""
+        with self._lock:
+            return self._statuses.get(project_id)
+
+    def join(self):
+        """Block until every queued record has been attempted"""
+        self._queue.join()
+
+    @contextmanager
+    def _journal_lock(self):
+        """Hold the journal's lock across processes while it is appended to or rewritten"""
+        with open(self.journal_path + ".lock", "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _append_journal(self, entry, sync=False):
+        with self._journal_lock(), open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _read_journal(self):
+        """Submit entries not yet marked done, by project ID, from every process"""
+        outstanding = {}
+        if not os.path.exists(self.journal_path):
+            return outstanding
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash mid-write
+                if entry["op"] == "submit":
+                    outstanding[entry["record"]["project_id"]] = entry
+                elif entry["op"] == "done":
+                    outstanding.pop(entry["project_id"], None)
+        return outstanding
+
+    def _replay_journal(self):
+        with self._journal_lock():
+            for project_id, entry in self._read_journal().items():
+                if entry.get("pid") != os.getpid() and _process_alive(entry.get("pid")):
+                    continue  # still being saved by the process that submitted it
+                self._outstanding[project_id] = entry["record"]
+                self._replayed.add(project_id)
+                self._statuses[project_id] = (PENDING, None)
+                self._queue.put(entry["record"])
+            self._compact_journal()
+
+    def _compact_journal(self):
+        """Rewrite the journal with only the records still outstanding in any process.
+
+        Callers hold the journal lock, so no other writer appends in between.
+        """
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self._read_journal().values():
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def _finish(self, project_id, status, message=None):
+        with self._lock:
+            self._statuses[project_id] = (status, message)
+            self._outstanding.pop(project_id, None)
+            self._append_journal({"op": "done", "project_id": project_id, "status": status})
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._persist(batch)
+            except Exception as e:
+                # Keep the worker alive; the rows stay journaled for the next start
+                self._fail_pending(batch, f"Save failed unexpectedly: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if self._queue.empty():
+                try:
+                    with self._lock, self._journal_lock():
+                        self._compact_journal()
+                except OSError:
+                    pass  # compaction only saves space; the next one will catch up
+
+    def _persist(self, batch):
+        for attempt in range(self.max_retries):
+            try:
+                result = bulk_insert_projects(self.client, batch, cache=self.cache)
+            except Exception as e:
+                error = str(e)
+            else:
+                for project_id, message in result.errors:
+                    # The database rejected the row itself; retrying cannot help
+                    self._finish(project_id, FAILED, message)
+                for project_id in result.inserted:
+                    self._finish(project_id, SAVED)
+                for project_id in result.conflicts:
+                    if project_id in self._replayed:
+                        self._finish(project_id, SAVED)
+                    else:
+                        self._finish(project_id, CONFLICT, "A project with this ID already exists")
+                return
+            time.sleep(self.retry_delay * 2 ** attempt)
+
+        # The request never got through; leave these in the journal so the next start retries them
+        self._fail_pending(batch, error)
+
+    def _fail_pending(self, batch, message):
+        """Report the batch's unanswered rows as failed without journaling them as done"""
+        with self._lock:
+            for record in batch:
+                if self._statuses.get(record["project_id"], (PENDING,))[0] == PENDING:
+                    self._statuses[record["project_id"]] = (FAILED, message)
+
+
+def _process_alive(pid):
+    """Whether `pid` is a running process; unknown or unverifiable PIDs count as gone"""
+    if pid is None or os.name != "posix":
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True